@@ -0,0 +1,120 @@
+from collections import OrderedDict
+import threading
+from typing import Optional
+
+import numpy as np
+
+from WordList.Feedback import WordsToArray
+from WordList.TypeDefs import Word, Letter
+import WordList.Constants as Constants
+
+LETTER_COUNT = 26
+
+def LetterMask(letters: str) -> int:
+    # Set one bit per distinct letter, bit 0 for a through to bit 25 for z
+    mask = 0
+
+    for letter in letters:
+        mask |= 1 << (ord(letter) - ord('a'))
+
+    return mask
+
+class CandidateIndex:
+    def __init__(self, words: list[Word], letters: Optional[np.ndarray] = None) -> None:
+        # Keep the words so indices can be turned back into words
+        self.words = words
+
+        # Store the letter code for each position of each word, from the ASCII letters of the words if they are given
+        self._letters = letters.astype(np.intp) - ord('a') if letters is not None else WordsToArray(words).astype(np.intp)
+
+        # Store a 26 bit mask of the letters in each word
+        self._masks = np.bitwise_or.reduce(np.left_shift(np.uint32(1), self._letters.astype(np.uint32)), axis=1)
+
+        # Store whether each word contains each letter, used to score each letter only once per word
+        self._hasLetter = ((self._masks[:, None] >> np.arange(LETTER_COUNT, dtype=np.uint32)) & 1).astype(np.int64)
+
+        # Flatten the position and letter into a single index into a position by letter table
+        self._positionLetters = self._letters + np.arange(Constants.MAX_LETTERS) * LETTER_COUNT
+
+        # Count the letters in each word, and each letter in each position
+        letterCounts = np.zeros((len(words), LETTER_COUNT), dtype=np.int64)
+        np.add.at(letterCounts, (np.arange(len(words))[:, None], self._letters), 1)
+        positionCounts = np.zeros((len(words), Constants.MAX_LETTERS * LETTER_COUNT), dtype=np.int64)
+        np.put_along_axis(positionCounts, self._positionLetters, 1, axis=1)
+
+        # Cache the counts for every suffix of the word list, so the first round of any day is a lookup
+        self._suffixLetterCounts = np.zeros((len(words) + 1, LETTER_COUNT), dtype=np.int64)
+        self._suffixLetterCounts[:-1] = np.cumsum(letterCounts[::-1], axis=0)[::-1]
+        self._suffixPositionCounts = np.zeros((len(words) + 1, Constants.MAX_LETTERS * LETTER_COUNT), dtype=np.int64)
+        self._suffixPositionCounts[:-1] = np.cumsum(positionCounts[::-1], axis=0)[::-1]
+
+    @staticmethod
+    def ForWords(words: list[Word], letters: Optional[np.ndarray] = None) -> 'CandidateIndex':
+        # Share the index between all users of the same word list, the letters are only used if it has to be built
+        key = tuple(words)
+
+        with _indexCacheLock:
+            if key in _indexCache:
+                _indexCache.move_to_end(key)
+                return _indexCache[key]
+
+        index = CandidateIndex(list(words), letters)
+
+        # Keep the index, forgetting the least recently used once over the limit
+        with _indexCacheLock:
+            _indexCache[key] = index
+
+            while len(_indexCache) > Constants.CANDIDATE_INDEX_CACHE_SIZE:
+                _indexCache.popitem(last=False)
+
+        return index
+
+    def Words(self, candidates: np.ndarray) -> list[Word]:
+        # Turn an array of indices back into a list of words
+        return [self.words[index] for index in candidates.tolist()]
+
+    def FirstRoundCounts(self, dayNumber: int) -> tuple[np.ndarray, np.ndarray]:
+        # Return copies of the letter and position counts for all of the words from this day onwards
+        return self._suffixLetterCounts[dayNumber].copy(), self._suffixPositionCounts[dayNumber].copy()
+
+    def RemoveCounts(self, removed: np.ndarray, letterCounts: np.ndarray, positionCounts: np.ndarray) -> None:
+        # Subtract the contribution of the removed words from the counts in place
+        letterCounts -= np.bincount(self._letters[removed].ravel(), minlength=LETTER_COUNT)
+        positionCounts -= np.bincount(self._positionLetters[removed].ravel(), minlength=Constants.MAX_LETTERS * LETTER_COUNT)
+
+    def LetterScores(self, candidates: np.ndarray, letterCounts: np.ndarray) -> np.ndarray:
+        # Score each word with the count of each distinct letter it contains
+        return self._hasLetter[candidates] @ letterCounts
+
+    def PositionScores(self, candidates: np.ndarray, positionCounts: np.ndarray) -> np.ndarray:
+        # Score each word with the count of each of its letters in that position
+        return positionCounts[self._positionLetters[candidates]].sum(axis=1)
+
+    def Matches(self, candidates: np.ndarray, goodLetterPositions: list[Letter], badLetterPositions: list[Letter], excludedLetters: str, goodLetters: str) -> np.ndarray:
+        # Get the letter masks for the candidates
+        masks = self._masks[candidates]
+
+        # Remove words containing any excluded letters
+        keep = (masks & LetterMask(excludedLetters)) == 0
+
+        # Remove words not containing all of the good letters
+        goodMask = LetterMask(goodLetters)
+        keep &= (masks & goodMask) == goodMask
+
+        # Get the letters of the candidates
+        letters = self._letters[candidates]
+
+        # Remove words without letters in known good positions or with letters in known bad positions
+        for position in range(Constants.MAX_LETTERS):
+            if goodLetterPositions[position] != '_':
+                keep &= letters[:, position] == ord(goodLetterPositions[position]) - ord('a')
+
+            if badLetterPositions[position] != '_':
+                keep &= letters[:, position] != ord(badLetterPositions[position]) - ord('a')
+
+        # Return a mask of the candidates that are still in contention
+        return keep
+
+# The index for each recently used word list, least recently used first
+_indexCache: OrderedDict[tuple[Word, ...], CandidateIndex] = OrderedDict()
+_indexCacheLock = threading.Lock()
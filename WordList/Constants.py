@@ -1,4 +1,5 @@
 from datetime import date
+import os
 
 # Set the characters for good and bad letters
 INCORRECT_LETTER = '⬜'
@@ -22,4 +23,25 @@ SCORE_SIZE_Y = 70
 BAR_SIZE = (700, 70)
 
 BASE_URL = 'https://www.nytimes.com/games/wordle/'
-INDEX_PAGE = 'index.html'
\ No newline at end of file
+INDEX_PAGE = 'index.html'
+
+FEEDBACK_MATRIX_FILE = 'WordList/FeedbackMatrix.npz'
+FEEDBACK_BLOCK_SIZE = 256
+FEEDBACK_CODE_COUNT = 3 ** MAX_LETTERS
+
+REPLAY_CHUNK_SIZE = 64
+CANDIDATE_INDEX_CACHE_SIZE = 4
+GUESS_CACHE_MAX_ENTRIES = 20000
+WORD_STORE_FILE = 'WordList/Words.bin'
+JS_URL_PATTERN = r'https://www\.nytimes\.com/games-assets/v2/wordle\.([a-f0-9]+)\.js'
+DOWNLOAD_CACHE_TTL = 3600
+DOWNLOAD_TIMEOUT = 10
+SOLVER_RESULT_CACHE_SIZE = 32
+DIST_BAR_CACHE_SIZE = 64
+DIST_IMAGE_CACHE_SIZE = 8
+STORAGE_PATH = '/storage'
+RESULTS_STORE_FILE = 'results.sqlite3'
+OPENING_BOOK_FILE = 'WordList/OpeningBook.npz'
+# Set WORDLEPAL_PROFILE_SOLVER=1 in the environment to log the stage timings of each /guess
+PROFILE_SOLVER = os.environ.get('WORDLEPAL_PROFILE_SOLVER', '').lower() in ('1', 'true', 'yes')
+PROFILE_SLOWEST_GAMES = 5
@@ -0,0 +1,28 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional, TypeVar
+
+import WordList.Constants as Constants
+
+# The result sent back to the main process for each day
+DayResult = TypeVar('DayResult')
+
+# The object each worker process plays its days with, created once when the worker starts
+_dayWords: Any = None
+
+def _InitialiseDayWorker(createWords: Callable[[], Any]) -> None:
+    global _dayWords
+
+    # Load the word lists once per worker and reuse them for every day it plays
+    _dayWords = createWords()
+
+def _RunDay(playDay: Callable[[Any, int], DayResult], dayNumber: int) -> DayResult:
+    assert _dayWords is not None
+
+    return playDay(_dayWords, dayNumber)
+
+def MapDays(createWords: Callable[[], Any], playDay: Callable[[Any, int], DayResult], dayCount: int, maxWorkers: Optional[int] = None) -> list[DayResult]:
+    # Play every day in chunks across a pool of worker processes, the results come back in day order.
+    # Both functions are sent to the workers so must be module level functions or partials of them
+    with ProcessPoolExecutor(max_workers=maxWorkers, initializer=_InitialiseDayWorker, initargs=(createWords,)) as executor:
+        return list(executor.map(partial(_RunDay, playDay), range(dayCount), chunksize=Constants.REPLAY_CHUNK_SIZE))
@@ -5,110 +5,245 @@ from pathlib import Path
 import requests
 import json
 import re
+import time
+from typing import Mapping, Optional
 
-from WordList.SolutionWords import SOLUTION_WORDS
-from WordList.ValidWords import VALID_WORDS
+import aiohttp
+import numpy as np
 
-from WordList.Constants import BASE_URL, SOLUTION_WORD_OFFSET, INDEX_PAGE
+from WordList.WordStore import WordStore
+from WordList.TypeDefs import Word
+
+from WordList.Constants import BASE_URL, SOLUTION_WORD_OFFSET, INDEX_PAGE, JS_URL_PATTERN, DOWNLOAD_CACHE_TTL, DOWNLOAD_TIMEOUT
+
+def DefaultWords(wordStore: Optional[WordStore]) -> tuple[list[Word], list[Word], str]:
+    # Use the binary word store if there is one, along with the hash of the JS it came from
+    if wordStore is not None:
+        return wordStore.solutionWords, wordStore.validWords, wordStore.sourceHash
+
+    # Otherwise fall back to the word lists shipped as Python modules
+    from WordList.SolutionWords import SOLUTION_WORDS
+    from WordList.ValidWords import VALID_WORDS
+
+    return SOLUTION_WORDS, VALID_WORDS, ''
+
+class DownloadCache:
+    def __init__(self) -> None:
+        # The validators sent back by the server for the index page of each URL
+        self.etags: dict[str, str] = {}
+        self.lastModified: dict[str, str] = {}
+
+        # The words last downloaded from each URL, the hash of the JS they came from and when they were checked
+        self.words: dict[str, tuple[list[Word], list[Word], str]] = {}
+        self.checkedAt: dict[str, float] = {}
+
+    def Fresh(self, url: str, ttl: float) -> bool:
+        # The words are fresh if they were checked within the time to live
+        return url in self.words and time.monotonic() - self.checkedAt[url] < ttl
+
+    def Headers(self, url: str) -> dict[str, str]:
+        # Only ask for the page if it has changed, as long as there are words to fall back on
+        headers: dict[str, str] = {}
+
+        if url in self.words:
+            if url in self.etags:
+                headers['If-None-Match'] = self.etags[url]
+
+            if url in self.lastModified:
+                headers['If-Modified-Since'] = self.lastModified[url]
+
+        return headers
+
+    def Update(self, url: str, responseHeaders: Mapping[str, str], words: tuple[list[Word], list[Word], str]) -> None:
+        # Remember the validators, the words and when they were checked
+        if 'ETag' in responseHeaders:
+            self.etags[url] = responseHeaders['ETag']
+
+        if 'Last-Modified' in responseHeaders:
+            self.lastModified[url] = responseHeaders['Last-Modified']
+
+        self.words[url] = words
+        self.Touch(url)
+
+    def Touch(self, url: str) -> None:
+        self.checkedAt[url] = time.monotonic()
+
+    def Clear(self) -> None:
+        self.etags.clear()
+        self.lastModified.clear()
+        self.words.clear()
+        self.checkedAt.clear()
+
+# Keep the downloaded words for the whole process so each WordDownloader does not have to fetch them again
+downloadCache = DownloadCache()
 
 class WordDownloader():
-    def __init__(self, url: str = f'{BASE_URL}{INDEX_PAGE}', downloadWords: bool = True) -> None:
+    def __init__(self, url: str = f'{BASE_URL}{INDEX_PAGE}', downloadWords: bool = True, cacheTtl: float = DOWNLOAD_CACHE_TTL, jsUrlPattern: str = JS_URL_PATTERN) -> None:
         # Set the delimiters used to extract the words from the JavaScript
         self._url = url
+        self._jsRegex = re.compile(jsUrlPattern)
+
+        # Set how long downloaded words are used before checking for new ones
+        self._cacheTtl = cacheTtl
 
-        # Use the defaults to start with
-        self.solutionWords = SOLUTION_WORDS
-        self.validWords = VALID_WORDS
+        # Use the defaults to start with, keeping the word store they came from so its letters can be used
+        self._wordStore = WordStore.Load()
+        self._defaultWords = DefaultWords(self._wordStore)
+        self.solutionWords, self.validWords, self.sourceHash = self._defaultWords
 
         # Get and parse the JavaScript if requested to update the words
         if downloadWords:
             self._DownloadWords()
-        
+
+    @property
+    def solutionLetters(self) -> Optional[np.ndarray]:
+        # The solution words as rows of ASCII letters straight from the word store, if they are the ones in it
+        if self._wordStore is None or self.solutionWords is not self._defaultWords[0]:
+            return None
+
+        return self._wordStore.solutionLetters
+
+    def _KnownWords(self, jsHash: str) -> Optional[tuple[list[Word], list[Word], str]]:
+        # Return the words already held for this JS hash, either the defaults or the last download
+        if jsHash == self._defaultWords[2]:
+            return self._defaultWords
+
+        if self._url in downloadCache.words and jsHash == downloadCache.words[self._url][2]:
+            return downloadCache.words[self._url]
+
+        return None
+
+    def _ParseJs(self, fullText: str, jsHash: str) -> tuple[list[Word], list[Word], str]:
+        # Compile a regex to match a JS list of five character strings
+        # surrounded by square brackets that may or may not have commas
+        wordRegex = re.compile(r'(\[("[a-z]{5}",?)+\])')
+
+        # Find the matches
+        wordLists = wordRegex.findall(fullText)
+
+        # The first match is the list of words
+        allWords = json.loads(wordLists[0][0])
+
+        # Save the Wordle JS file if it has changed, the words are still used if it cannot be written
+        wordlePath = Path('WordList/Wordle.js')
+
+        try:
+            if not wordlePath.exists() or wordlePath.read_text(encoding='utf-8') != fullText:
+                with open(wordlePath, 'w', encoding='utf-8') as wordleFile:
+                    wordleFile.write(fullText)
+        except OSError:
+            print('Wordle JS could not be saved')
+
+        # The solutions are in the second part of the list and the valid words in the first
+        return allWords[SOLUTION_WORD_OFFSET:], allWords[:SOLUTION_WORD_OFFSET], jsHash
+
+    def _UseDefaultWords(self) -> None:
+        # If there is any kind of download or parsing error, reset the words back to the original ones
+        self.solutionWords, self.validWords, self.sourceHash = self._defaultWords
+
+        # Indicate that we are using defaults
+        print('Download or parsing failed, using default word lists')
+
+    def _UseCachedWords(self, message: str) -> None:
+        # Use the words from the last download
+        self.solutionWords, self.validWords, self.sourceHash = downloadCache.words[self._url]
+        print(message)
+
+    def _UseDownloadedWords(self, responseHeaders: Mapping[str, str], words: tuple[list[Word], list[Word], str]) -> None:
+        # Remember the words and the page validators for next time
+        downloadCache.Update(self._url, responseHeaders, words)
+
+        # Show that the words were downloaded OK
+        print('Downloaded words succesfully')
+
+        self.solutionWords, self.validWords, self.sourceHash = words
+
+        # If download and parsing was successful, update the word store
+        # in case of changes for use another day if necessary
+        if words != self._defaultWords:
+            WordStore.Save(self.solutionWords, self.validWords, self.sourceHash)
+
     def _DownloadWords(self) -> None:
+        # Use the words from the last download if they were checked recently enough
+        if downloadCache.Fresh(self._url, self._cacheTtl):
+            self._UseCachedWords('Using recently downloaded words')
+            return
+
         try:
-            # Get the HTML file
-            response = requests.get(self._url)
+            # Get the HTML file, unless it has not changed since last time
+            response = requests.get(self._url, headers=downloadCache.Headers(self._url), timeout=DOWNLOAD_TIMEOUT)
 
-            # Check the response code, if OK, update the defaults with the downloaded words
-            if response.status_code == requests.codes.OK:
-                # If the download was OK, get the full text
-                fullText = response.text
+            if response.status_code == requests.codes.NOT_MODIFIED:
+                # The page has not changed so neither have the words
+                downloadCache.Touch(self._url)
+                self._UseCachedWords('Words not modified since last download')
+                return
 
-                # Compile a regex to match the javascript file
-                jsRegex = re.compile(r'https://www\.nytimes\.com/games-assets/v2/wordle\.[a-f0-9]+\.js')
+            # Check the response code, if OK, update the defaults with the downloaded words
+            words: Optional[tuple[list[Word], list[Word], str]] = None
 
+            if response.status_code == requests.codes.OK:
                 # Find the current name of the javascript file
-                jsFile = jsRegex.search(fullText)
+                jsFile = self._jsRegex.search(response.text)
 
-                # If there is a match, download the js file
+                # If there is a match, download the js file unless its hash shows the words are already known
                 if jsFile:
-                    # Get the JavaScript file
-                    response = requests.get(f'{jsFile.group()}')
-
-                    if response.status_code == requests.codes.OK:
-                        # Get the text
-                        fullText = response.text
-                        
-                        # Compile a regex to match a JS list of five character strings
-                        # surrounded by square brackets that may or may not have commas
-                        wordRegex = re.compile(r'(\[("[a-z]{5}",?)+\])')
-
-                        # Find the matches
-                        wordLists = wordRegex.findall(fullText)
-
-                        # The first match is the list of words
-                        allWords = json.loads(wordLists[0][0])
-
-                        # The valid words are in the first part of the list
-                        self.validWords = allWords[:SOLUTION_WORD_OFFSET]
-
-                        # The solutions are in the second part of the list
-                        self.solutionWords = allWords[SOLUTION_WORD_OFFSET:]
-
-                        # Save the Wordle JS file
-                        with open(Path('WordList/Wordle.js'), 'w', encoding='utf-8') as wordleFile:
-                            wordleFile.write(fullText)
-                    else:
-                        # If there is any kind of download or parsing error, reset the words back to the original ones
-                        self.solutionWords = SOLUTION_WORDS
-                        self.validWords = VALID_WORDS
-
-                        # Indicate that we are using defaults
-                        print('Download or parsing failed, using default word lists')
-                else:
-                    # If there is any kind of download or parsing error, reset the words back to the original ones
-                    self.solutionWords = SOLUTION_WORDS
-                    self.validWords = VALID_WORDS
-
-                    # Indicate that we are using defaults
-                    print('Download or parsing failed, using default word lists')
-            else:
-                # If there is any kind of download or parsing error, reset the words back to the original ones
-                self.solutionWords = SOLUTION_WORDS
-                self.validWords = VALID_WORDS
-
-                # Indicate that we are using defaults
-                print('Download or parsing failed, using default word lists')
+                    words = self._KnownWords(jsFile.group(1))
+
+                    if words is None:
+                        # Get the JavaScript file
+                        jsResponse = requests.get(jsFile.group(), timeout=DOWNLOAD_TIMEOUT)
+
+                        if jsResponse.status_code == requests.codes.OK:
+                            words = self._ParseJs(jsResponse.text, jsFile.group(1))
         except:
-            # If there is any kind of download or parsing error, reset the words back to the original ones
-            self.solutionWords = SOLUTION_WORDS
-            self.validWords = VALID_WORDS
+            words = None
+
+        if words is None:
+            self._UseDefaultWords()
+        else:
+            self._UseDownloadedWords(response.headers, words)
+
+    async def DownloadWordsAsync(self, session: aiohttp.ClientSession) -> None:
+        # Update the words in the same way as _DownloadWords, without blocking the event loop
+        if downloadCache.Fresh(self._url, self._cacheTtl):
+            self._UseCachedWords('Using recently downloaded words')
+            return
+
+        timeout = aiohttp.ClientTimeout(total=DOWNLOAD_TIMEOUT)
+        words: Optional[tuple[list[Word], list[Word], str]] = None
+
+        try:
+            # Get the HTML file, unless it has not changed since last time
+            async with session.get(self._url, headers=downloadCache.Headers(self._url), timeout=timeout) as response:
+                if response.status == 304:
+                    # The page has not changed so neither have the words
+                    downloadCache.Touch(self._url)
+                    self._UseCachedWords('Words not modified since last download')
+                    return
+
+                responseHeaders = response.headers
+                pageText = await response.text() if response.status == 200 else ''
+
+            # Find the current name of the javascript file
+            jsFile = self._jsRegex.search(pageText)
+
+            # If there is a match, download the js file unless its hash shows the words are already known
+            if jsFile:
+                words = self._KnownWords(jsFile.group(1))
+
+                if words is None:
+                    # Get the JavaScript file
+                    async with session.get(jsFile.group(), timeout=timeout) as jsResponse:
+                        if jsResponse.status == 200:
+                            words = self._ParseJs(await jsResponse.text(), jsFile.group(1))
+        except Exception:
+            words = None
 
-            # Indicate that we are using defaults
-            print('Download or parsing failed, using default word lists')
+        if words is None:
+            self._UseDefaultWords()
         else:
-            # Show that the words were downloaded OK
-            print('Downloaded words succesfully')
-
-            # If download and parsing was successful, update the default solution and
-            # valid word files in case of changes for use another day if necessary
-            with open(Path('WordList/SolutionWords.py'), 'w', encoding='utf-8') as solutionFile:
-                wordList = json.dumps(self.solutionWords)
-                solutionFile.write(f'SOLUTION_WORDS: list[str] = {wordList}')
-
-            with open(Path('WordList/ValidWords.py'), 'w', encoding='utf-8') as validFile:
-                wordList = json.dumps(self.validWords)
-                validFile.write(f'VALID_WORDS: list[str] = {wordList}')
+            self._UseDownloadedWords(responseHeaders, words)
 
 if __name__ == '__main__':
     # Test this class
@@ -0,0 +1,198 @@
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from WordList.TypeDefs import Word
+import WordList.Constants as Constants
+
+# Each letter of a guess is encoded as a base 3 digit, the first letter being the least significant
+LETTER_CODES = {Constants.INCORRECT_LETTER: 0, Constants.LETTER_IN_WORD: 1, Constants.LETTER_IN_POSITION: 2}
+CODE_LETTERS = [Constants.INCORRECT_LETTER, Constants.LETTER_IN_WORD, Constants.LETTER_IN_POSITION]
+POWERS_OF_THREE = [3 ** position for position in range(Constants.MAX_LETTERS)]
+
+# The code for a row of all letters in position
+SOLVED_CODE = sum(2 * power for power in POWERS_OF_THREE)
+
+def GraphicToCode(guessGraphic: list[str]) -> int:
+    # Sum the digit of each letter multiplied by the power of three for its position
+    return sum(LETTER_CODES[letter] * power for letter, power in zip(guessGraphic, POWERS_OF_THREE))
+
+def CodeToGraphic(code: int) -> list[str]:
+    # Peel off the base 3 digits one at a time, least significant first
+    guessGraphic: list[str] = []
+
+    for _ in range(Constants.MAX_LETTERS):
+        code, digit = divmod(code, 3)
+        guessGraphic.append(CODE_LETTERS[digit])
+
+    return guessGraphic
+
+def FeedbackCode(guess: Word, answer: Word) -> int:
+    # Work out the code one letter at a time, this matches the graphic built by Words
+    code = 0
+
+    for position, letter in enumerate(guess):
+        if letter == answer[position]:
+            # The letter is in the correct position
+            code += 2 * POWERS_OF_THREE[position]
+        elif letter in answer:
+            # How many times has this letter been in a good position before this one
+            timesLetterGood = sum(1 for index in range(position) if guess[index] == letter == answer[index])
+
+            # How many times has this letter been in the word but in a bad position up to and including this one
+            timesLetterBad = sum(1 for index in range(position + 1) if guess[index] == letter != answer[index])
+
+            # Only mark the letter as in the word if it has not already been accounted for
+            if (timesLetterGood + timesLetterBad) <= answer.count(letter):
+                code += POWERS_OF_THREE[position]
+
+    return code
+
+def MatchCode(guess: Word, answer: Word) -> int:
+    # Work out the code the candidate filter sees, each letter is in position, elsewhere in the answer or not in it at all
+    code = 0
+
+    for position, letter in enumerate(guess):
+        if letter == answer[position]:
+            code += 2 * POWERS_OF_THREE[position]
+        elif letter in answer:
+            code += POWERS_OF_THREE[position]
+
+    return code
+
+def WordsToArray(words: list[Word]) -> np.ndarray:
+    # Convert the words to an array of letter indices, one row per word
+    return (np.frombuffer(''.join(words).encode('ascii'), dtype=np.uint8).reshape(-1, Constants.MAX_LETTERS) - ord('a')).astype(np.int8)
+
+def _BuildFeedbackCodes(guessArray: np.ndarray, answerArray: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # The graphic and match codes for each guess against every answer
+    codes = np.empty((len(guessArray), len(answerArray)), dtype=np.uint8)
+    matchCodes = np.empty((len(guessArray), len(answerArray)), dtype=np.uint8)
+
+    # Masks selecting earlier positions, and earlier positions including this one
+    earlierPositions = np.tri(Constants.MAX_LETTERS, k=-1, dtype=bool)
+    earlierOrThisPosition = np.tri(Constants.MAX_LETTERS, dtype=bool)
+
+    # The power of three for each position
+    powers = np.array(POWERS_OF_THREE, dtype=np.uint8)
+
+    # Work through the guesses in blocks to keep the intermediate arrays small
+    for start in range(0, len(guessArray), Constants.FEEDBACK_BLOCK_SIZE):
+        guesses = guessArray[start:start + Constants.FEEDBACK_BLOCK_SIZE]
+
+        # Letters in the correct position, indexed by guess, answer and position
+        inPosition = guesses[:, None, :] == answerArray[None, :, :]
+
+        # How many times each guess letter appears anywhere in the answer
+        timesLetterInWord = (guesses[:, None, :, None] == answerArray[None, :, None, :]).sum(axis=3, dtype=np.uint8)
+
+        # Letters in the answer but not in this position
+        inBadPosition = ~inPosition & (timesLetterInWord > 0)
+
+        # Which positions of each guess share the same letter, indexed by guess, position and other position
+        sameLetter = guesses[:, :, None] == guesses[:, None, :]
+
+        # Count the times each letter has been good before this position and bad up to this position
+        timesLetterGood = inPosition.astype(np.uint8) @ (sameLetter & earlierPositions).transpose(0, 2, 1).astype(np.uint8)
+        timesLetterBad = inBadPosition.astype(np.uint8) @ (sameLetter & earlierOrThisPosition).transpose(0, 2, 1).astype(np.uint8)
+
+        # Letters in the word are only marked if they have not already been accounted for
+        inWord = inBadPosition & ((timesLetterGood + timesLetterBad) <= timesLetterInWord)
+
+        # Combine the digits into a single code per guess and answer
+        digits = 2 * inPosition.astype(np.uint8) + inWord.astype(np.uint8)
+        codes[start:start + len(guesses)] = (digits * powers).sum(axis=2, dtype=np.uint8)
+
+        # The match code marks every letter in the answer, whether or not it has already been accounted for
+        digits = 2 * inPosition.astype(np.uint8) + inBadPosition.astype(np.uint8)
+        matchCodes[start:start + len(guesses)] = (digits * powers).sum(axis=2, dtype=np.uint8)
+
+    return codes, matchCodes
+
+class FeedbackMatrix:
+    def __init__(self, guessWords: list[Word], answerWords: list[Word], filename: Optional[Path] = Path(Constants.FEEDBACK_MATRIX_FILE)) -> None:
+        # Store the words, removing any duplicate guesses while keeping the order
+        self.guessWords: list[Word] = list(dict.fromkeys(guessWords))
+        self.answerWords: list[Word] = list(answerWords)
+
+        # Create lookups from each word to its row or column in the matrix
+        self._guessIndex = {word: index for index, word in enumerate(self.guessWords)}
+        self._answerIndex = {word: index for index, word in enumerate(self.answerWords)}
+
+        # Try to load the matrices from disk, building and saving them if that fails
+        loaded = self._Load(filename)
+
+        if loaded is None:
+            self.codes, self.matchCodes = _BuildFeedbackCodes(WordsToArray(self.guessWords), WordsToArray(self.answerWords))
+            self._Save(filename)
+        else:
+            self.codes, self.matchCodes = loaded
+
+    def _Load(self, filename: Optional[Path]) -> Optional[tuple[np.ndarray, np.ndarray]]:
+        if filename is None or not filename.exists():
+            return None
+
+        try:
+            with np.load(filename) as matrixFile:
+                # Only use the saved matrix if it was built from the same word lists
+                if matrixFile['guessWords'].tolist() == self.guessWords and matrixFile['answerWords'].tolist() == self.answerWords:
+                    return matrixFile['codes'], matrixFile['matchCodes']
+        except (OSError, ValueError, KeyError):
+            print('Feedback matrix could not be read, rebuilding')
+
+        return None
+
+    def _Save(self, filename: Optional[Path]) -> None:
+        if filename is None:
+            return
+
+        try:
+            # Write to a temporary file then replace so a partly written matrix is never loaded
+            with open(filename.with_suffix('.tmp'), 'wb') as matrixFile:
+                np.savez(matrixFile, codes=self.codes, matchCodes=self.matchCodes, guessWords=np.array(self.guessWords), answerWords=np.array(self.answerWords))
+
+            filename.with_suffix('.tmp').replace(filename)
+        except OSError:
+            print('Feedback matrix could not be saved, keeping it in memory only')
+
+    @classmethod
+    def FromWordLists(cls, solutionWords: list[Word], validWords: list[Word], filename: Optional[Path] = Path(Constants.FEEDBACK_MATRIX_FILE)) -> 'FeedbackMatrix':
+        # Any solution or valid word can be guessed, but only solution words can be the answer
+        return cls(solutionWords + validWords, solutionWords, filename=filename)
+
+    def Contains(self, guess: Word, answer: Word) -> bool:
+        return guess in self._guessIndex and answer in self._answerIndex
+
+    def Code(self, guess: Word, answer: Word) -> int:
+        # Look up the code, falling back to working it out if either word is not in the matrix
+        if self.Contains(guess, answer):
+            return int(self.codes[self._guessIndex[guess], self._answerIndex[answer]])
+
+        return FeedbackCode(guess, answer)
+
+    def Graphic(self, guess: Word, answer: Word) -> list[str]:
+        return CodeToGraphic(self.Code(guess, answer))
+
+    def GuessRows(self, words: list[Word]) -> np.ndarray:
+        return np.array([self._guessIndex[word] for word in words], dtype=np.intp)
+
+    def AnswerColumns(self, words: list[Word]) -> np.ndarray:
+        return np.array([self._answerIndex[word] for word in words], dtype=np.intp)
+
+    def ExpectedRemaining(self, answerColumns: np.ndarray) -> np.ndarray:
+        # The expected number of answers left after each guess, averaged over the given answers
+        expected = np.empty(len(self.guessWords), dtype=np.float64)
+
+        # Work through the guesses in blocks to keep the intermediate arrays small
+        for start in range(0, len(self.guessWords), Constants.FEEDBACK_BLOCK_SIZE):
+            matchCodes = self.matchCodes[start:start + Constants.FEEDBACK_BLOCK_SIZE, answerColumns].astype(np.intp)
+
+            # Bucket the answers by match code for every guess in the block at once by giving each guess its own range of codes
+            offsets = np.arange(len(matchCodes))[:, None] * Constants.FEEDBACK_CODE_COUNT
+            bucketSizes = np.bincount((matchCodes + offsets).ravel(), minlength=len(matchCodes) * Constants.FEEDBACK_CODE_COUNT).reshape(len(matchCodes), -1)
+
+            # An answer in a bucket of n leaves n answers in contention
+            expected[start:start + len(matchCodes)] = (bucketSizes ** 2).sum(axis=1)
+
+        return expected / len(answerColumns)
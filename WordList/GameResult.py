@@ -0,0 +1,60 @@
+from typing import Any, NoReturn
+
+from WordList.Feedback import CodeToGraphic
+from WordList.TypeDefs import Word
+
+class GameResult:
+    # Use slots so the thousands of results from a replay stay small
+    __slots__ = ('dayNumber', 'todaysWord', 'guesses', 'codes', 'solved', 'dateOutOfBounds')
+
+    dayNumber: int
+    todaysWord: Word
+    guesses: tuple[Word, ...]
+    codes: tuple[int, ...]
+    solved: bool
+    dateOutOfBounds: bool
+
+    def __init__(self, dayNumber: int, todaysWord: Word, guesses: tuple[Word, ...], codes: tuple[int, ...], solved: bool, dateOutOfBounds: bool = False) -> None:
+        # The day of the game, counted from the start date, and the word for that day
+        object.__setattr__(self, 'dayNumber', dayNumber)
+        object.__setattr__(self, 'todaysWord', todaysWord)
+
+        # The words guessed, in order
+        object.__setattr__(self, 'guesses', tuple(guesses))
+
+        # The feedback code for each guess, one base 3 digit per letter as used by the feedback matrix
+        object.__setattr__(self, 'codes', tuple(codes))
+
+        # Whether the last guess was today's word
+        object.__setattr__(self, 'solved', solved)
+
+        # Whether the requested date had to be moved to the first or last day
+        object.__setattr__(self, 'dateOutOfBounds', dateOutOfBounds)
+
+    def __setattr__(self, name: str, value: Any) -> NoReturn:
+        raise AttributeError(f'GameResult is immutable, cannot set {name}')
+
+    def __reduce__(self) -> tuple[type, tuple]:
+        # Rebuild through the constructor so results can be sent between processes
+        return GameResult, (self.dayNumber, self.todaysWord, self.guesses, self.codes, self.solved, self.dateOutOfBounds)
+
+    def __repr__(self) -> str:
+        return f'GameResult(dayNumber={self.dayNumber}, todaysWord={self.todaysWord!r}, guesses={self.guesses}, solved={self.solved})'
+
+    @property
+    def guessCount(self) -> int:
+        return len(self.guesses)
+
+    @property
+    def guessNumberString(self) -> str:
+        # The number of guesses taken, or 'X' if the word was not found
+        return str(self.guessCount) if self.solved else 'X'
+
+    @property
+    def guessHistory(self) -> list[list[str]]:
+        # Render the emoji graphic for each guess from its code
+        return [CodeToGraphic(code) for code in self.codes]
+
+    def GraphicLines(self) -> list[str]:
+        # Render each guess as a line of emoji
+        return [''.join(guessGraphic) for guessGraphic in self.guessHistory]
@@ -0,0 +1,114 @@
+from collections import OrderedDict
+import hashlib
+import json
+from pathlib import Path
+import threading
+import time
+from typing import Any, Optional
+
+from WordList.TypeDefs import Word
+import WordList.Constants as Constants
+
+class GuessCache:
+    def __init__(self, filename: Optional[Path] = None, maxEntries: int = Constants.GUESS_CACHE_MAX_ENTRIES, ttl: Optional[float] = None) -> None:
+        # Store the guesses with the least recently used first
+        self._guesses: OrderedDict[str, Any] = OrderedDict()
+
+        # Store when each guess expires if they are only kept for a time, wall clock time is used so the expiry survives a restart
+        self._ttl = ttl
+        self._expiresAt: dict[str, float] = {}
+
+        # Store the limit on the number of guesses kept and where to keep them
+        self._maxEntries = maxEntries
+        self._filename = filename
+
+        # Track whether there are changes which have not been saved
+        self._dirty = False
+
+        # Guard the guesses so the cache can be shared by solves on different threads
+        self._lock = threading.RLock()
+
+        # Load any previously saved guesses
+        self._Load()
+
+    def __len__(self) -> int:
+        return len(self._guesses)
+
+    @staticmethod
+    def Key(candidates: list[Word], strategy: str) -> str:
+        # Fingerprint the candidate words, in order, along with the strategy used to choose between them
+        fingerprint = hashlib.blake2b(digest_size=16)
+        fingerprint.update(strategy.encode('utf-8'))
+        fingerprint.update(''.join(candidates).encode('utf-8'))
+
+        return fingerprint.hexdigest()
+
+    def Get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            guess = self._guesses.get(key)
+
+            if guess is None:
+                return None
+
+            # Forget the guess once it has expired
+            if key in self._expiresAt and self._expiresAt[key] <= time.time():
+                del self._guesses[key]
+                del self._expiresAt[key]
+                self._dirty = True
+                return None
+
+            # Mark this guess as the most recently used
+            self._guesses.move_to_end(key)
+
+        return guess
+
+    def Put(self, key: str, guess: Any, expiresAt: Optional[float] = None) -> None:
+        with self._lock:
+            # Add or refresh the guess as the most recently used
+            self._guesses[key] = guess
+            self._guesses.move_to_end(key)
+            self._dirty = True
+
+            if self._ttl is not None:
+                self._expiresAt[key] = expiresAt if expiresAt is not None else time.time() + self._ttl
+
+            # Evict the least recently used guesses once over the limit
+            while len(self._guesses) > self._maxEntries:
+                evictedKey, _ = self._guesses.popitem(last=False)
+                self._expiresAt.pop(evictedKey, None)
+
+    def _Load(self) -> None:
+        if self._filename is None or not self._filename.exists():
+            return
+
+        try:
+            with open(self._filename, 'r', encoding='utf-8') as cacheFile:
+                # Saved guesses are stored least recently used first so the order is kept, with their expiry if they have one
+                for key, saved in json.load(cacheFile).items():
+                    if self._ttl is None:
+                        self.Put(key, saved)
+                    elif saved[0] > time.time():
+                        self.Put(key, saved[1], saved[0])
+        except (OSError, ValueError, TypeError, IndexError):
+            print(f'Cache {self._filename} could not be read, starting empty')
+
+        self._dirty = False
+
+    def Save(self) -> None:
+        if self._filename is None or not self._dirty:
+            return
+
+        with self._lock:
+            # Store the expiry alongside each guess if they have one
+            saved = {key: [self._expiresAt[key], guess] if self._ttl is not None else guess for key, guess in self._guesses.items()}
+
+            try:
+                # Write to a temporary file then replace so a partly written cache is never loaded
+                with open(self._filename.with_suffix('.tmp'), 'w', encoding='utf-8') as cacheFile:
+                    json.dump(saved, cacheFile)
+
+                self._filename.with_suffix('.tmp').replace(self._filename)
+            except OSError:
+                print(f'Cache {self._filename} could not be saved')
+            else:
+                self._dirty = False
@@ -0,0 +1,129 @@
+from argparse import ArgumentParser
+import hashlib
+from datetime import timedelta
+from functools import partial
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from WordList.DayPool import MapDays
+from WordList.DownloadWords import WordDownloader
+from WordList.Feedback import FeedbackCode, FeedbackMatrix
+from WordList.TypeDefs import Word
+import WordList.Constants as Constants
+
+# The code stored when a day has no second guess because the first guess was the answer
+NO_CODE = -1
+
+def _WordsChecksum(words: list[Word]) -> str:
+    return hashlib.blake2b('\n'.join(words).encode('utf-8'), digest_size=16).hexdigest()
+
+class OpeningBook:
+    def __init__(self, strategies: list[str], firstGuesses: np.ndarray, codes: np.ndarray, secondGuesses: np.ndarray) -> None:
+        # Map each strategy to its row in the tables, which have a column for each day
+        self._strategyRows = {strategy: row for row, strategy in enumerate(strategies)}
+
+        # The first guess for each day, the feedback it got from that day's word and the second guess chosen from that feedback
+        self.firstGuesses = firstGuesses
+        self.codes = codes
+        self.secondGuesses = secondGuesses
+
+    @property
+    def strategies(self) -> list[str]:
+        return list(self._strategyRows)
+
+    @classmethod
+    def Load(cls, solutionWords: list[Word], validWords: list[Word], filename: Path = Path(Constants.OPENING_BOOK_FILE)) -> Optional['OpeningBook']:
+        if not filename.exists():
+            return None
+
+        try:
+            with np.load(filename) as bookFile:
+                # Only use the book if it was built from the same word lists, the guesses depend on both of them
+                if str(bookFile['solutionChecksum']) != _WordsChecksum(solutionWords) or str(bookFile['validChecksum']) != _WordsChecksum(validWords):
+                    return None
+
+                return cls(bookFile['strategies'].tolist(), bookFile['firstGuesses'], bookFile['codes'], bookFile['secondGuesses'])
+        except (OSError, ValueError, KeyError):
+            print('Opening book could not be read, scoring every guess')
+
+        return None
+
+    def Save(self, solutionWords: list[Word], validWords: list[Word], filename: Path = Path(Constants.OPENING_BOOK_FILE)) -> None:
+        # Write to a temporary file then replace so a partly written book is never loaded
+        with open(filename.with_suffix('.tmp'), 'wb') as bookFile:
+            np.savez_compressed(
+                bookFile,
+                strategies=np.array(self.strategies),
+                firstGuesses=self.firstGuesses,
+                codes=self.codes,
+                secondGuesses=self.secondGuesses,
+                solutionChecksum=np.array(_WordsChecksum(solutionWords)),
+                validChecksum=np.array(_WordsChecksum(validWords)),
+            )
+
+        filename.with_suffix('.tmp').replace(filename)
+
+    def FirstGuess(self, strategy: str, dayNumber: int) -> Optional[Word]:
+        # The first guess depends only on the day's remaining words and the strategy
+        row = self._strategyRows.get(strategy)
+
+        if row is None or dayNumber >= self.firstGuesses.shape[1]:
+            return None
+
+        return str(self.firstGuesses[row, dayNumber])
+
+    def SecondGuess(self, strategy: str, dayNumber: int, firstGuess: Word, code: int) -> Optional[Word]:
+        # The second guess only applies after the book's first guess and the feedback it was chosen for
+        if self.FirstGuess(strategy, dayNumber) != firstGuess:
+            return None
+
+        row = self._strategyRows[strategy]
+
+        if int(self.codes[row, dayNumber]) != code:
+            return None
+
+        return str(self.secondGuesses[row, dayNumber])
+
+def _CreateBookWords(feedbackMatrix: FeedbackMatrix):
+    # Words is imported here as it uses the book itself
+    from WordList.WordList import Words
+
+    # Load the word lists without an existing book so every guess is scored
+    return Words(downloadWords=False, feedbackMatrix=feedbackMatrix, useOpeningBook=False, expectedRemaining=True)
+
+def _OpenDay(words, dayNumber: int) -> list[tuple[Word, int, Word]]:
+    # Play the first two rounds of the day with each strategy
+    results = [words.SolveByMethod(strategy, wordDate=Constants.START_DATE + timedelta(days=dayNumber), maxGuesses=2) for strategy in words.scoringMethodNames]
+
+    # Keep the first guess, its feedback from the day's word and the second guess, if the first was not the answer
+    return [(result.guesses[0], FeedbackCode(result.guesses[0], result.todaysWord), result.guesses[1]) if result.guessCount > 1 else (result.guesses[0], NO_CODE, '') for result in results]
+
+def BuildOpeningBook(maxWorkers: Optional[int] = None, filename: Path = Path(Constants.OPENING_BOOK_FILE)) -> OpeningBook:
+    # Load the word lists and build the feedback matrix once so the book covers every strategy
+    wd = WordDownloader(downloadWords=False)
+    feedbackMatrix = FeedbackMatrix.FromWordLists(wd.solutionWords, wd.validWords)
+    strategies = _CreateBookWords(feedbackMatrix).scoringMethodNames
+
+    # Open every day across the worker processes
+    days = MapDays(partial(_CreateBookWords, feedbackMatrix), _OpenDay, len(wd.solutionWords), maxWorkers)
+
+    # Lay the openings out with a row for each strategy and a column for each day
+    firstGuesses = np.array([[day[row][0] for day in days] for row in range(len(strategies))], dtype=f'<U{Constants.MAX_LETTERS}')
+    codes = np.array([[day[row][1] for day in days] for row in range(len(strategies))], dtype=np.int16)
+    secondGuesses = np.array([[day[row][2] for day in days] for row in range(len(strategies))], dtype=f'<U{Constants.MAX_LETTERS}')
+
+    openingBook = OpeningBook(strategies, firstGuesses, codes, secondGuesses)
+    openingBook.Save(wd.solutionWords, wd.validWords, filename)
+
+    print(f'Opening book saved to {filename} for {len(strategies)} strategies over {len(days)} days')
+
+    return openingBook
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Build the opening book of first and second guesses for each day and strategy')
+    parser.add_argument('--workers', type=int, help='number of worker processes')
+    args = parser.parse_args()
+
+    BuildOpeningBook(maxWorkers=args.workers)
@@ -0,0 +1,150 @@
+from datetime import datetime
+from pathlib import Path
+import re
+import sqlite3
+import threading
+from typing import Optional
+
+from WordList.GameResult import GameResult
+import WordList.Constants as Constants
+
+# The possible scores, the number of guesses or 'X' if the word was not found
+SCORES = [str(guessCount) for guessCount in range(1, Constants.MAX_GUESSES + 1)] + ['X']
+
+def DefaultResultsPath() -> Path:
+    # Keep the results in storage if it is available so they survive a restart
+    storagePath = Path(Constants.STORAGE_PATH)
+
+    return storagePath / Constants.RESULTS_STORE_FILE if storagePath.exists() else Path(Constants.RESULTS_STORE_FILE)
+
+class ResultsStore:
+    def __init__(self, filename: Optional[Path] = None) -> None:
+        # Open the database, it is shared between threads so guard it with a lock
+        self._connection = sqlite3.connect(filename or DefaultResultsPath(), check_same_thread=False)
+        self._lock = threading.Lock()
+
+        with self._lock, self._connection:
+            # One row per day, and a running count of the games with each score
+            self._connection.execute('CREATE TABLE IF NOT EXISTS results (dayNumber INTEGER PRIMARY KEY, score TEXT NOT NULL, guesses TEXT NOT NULL)')
+            self._connection.execute('CREATE TABLE IF NOT EXISTS histogram (score TEXT PRIMARY KEY, games INTEGER NOT NULL)')
+            self._connection.execute('CREATE TABLE IF NOT EXISTS today (id INTEGER PRIMARY KEY CHECK (id = 0), dayNumber INTEGER NOT NULL, score TEXT NOT NULL)')
+            self._connection.executemany('INSERT OR IGNORE INTO histogram (score, games) VALUES (?, 0)', [(score,) for score in SCORES])
+
+            # Keep the histogram in memory as well so the stats never need the database
+            self._histogram: dict[str, int] = dict(self._connection.execute('SELECT score, games FROM histogram').fetchall())
+
+            # Keep the day number and score of today's game
+            self._today: Optional[tuple[int, str]] = self._connection.execute('SELECT dayNumber, score FROM today').fetchone()
+
+        # Bring in the results from the old history file the first time the store is used
+        if self.gameCount == 0:
+            self._ImportHistory()
+
+    def _ImportHistory(self) -> None:
+        historyPath = Path('history.txt')
+        guessesTodayPath = Path('guessesToday.txt')
+
+        if not historyPath.exists():
+            return
+
+        # The history file has one score per line, written for consecutive days up to the last day played
+        with open(historyPath, 'r', encoding='utf-8') as historyFile:
+            scores = [line.strip() for line in historyFile if line.strip() in SCORES]
+
+        # Number the days back from the last day played, if it is not known the scores only go into the histogram
+        lastDayNumber = self._LastHistoryDay()
+        firstDayNumber = lastDayNumber - len(scores) + 1 if lastDayNumber is not None else None
+
+        if firstDayNumber is not None and firstDayNumber < 0:
+            firstDayNumber = None
+
+        # Take today's score from the last game played
+        todaysScore = scores[-1] if scores else 'X'
+
+        if guessesTodayPath.exists():
+            with open(guessesTodayPath, 'r', encoding='utf-8') as guessesFile:
+                todaysScore = guessesFile.read().strip()
+
+        with self._lock:
+            with self._connection:
+                if firstDayNumber is not None:
+                    self._connection.executemany('INSERT OR REPLACE INTO results (dayNumber, score, guesses) VALUES (?, ?, ?)', [(dayNumber, score, '') for dayNumber, score in enumerate(scores, start=firstDayNumber)])
+
+                for score in scores:
+                    self._Increment(score, 1)
+
+            if scores and todaysScore in SCORES and lastDayNumber is not None:
+                self._SetToday(lastDayNumber, todaysScore)
+
+        print(f'Imported {len(scores)} results from {historyPath}')
+
+    @staticmethod
+    def _LastHistoryDay() -> Optional[int]:
+        readmePath = Path('README.md')
+
+        if not readmePath.exists():
+            return None
+
+        # The readme ends with today's word and the date it was updated, which is the last day in the history file
+        with open(readmePath, 'r', encoding='utf-8') as readmeFile:
+            updated = re.findall(r' - Updated (\d{2}-\d{2}-\d{4})$', readmeFile.read(), re.MULTILINE)
+
+        if not updated:
+            return None
+
+        try:
+            return (datetime.strptime(updated[-1], '%d-%m-%Y').date() - Constants.START_DATE).days
+        except ValueError:
+            return None
+
+    def _Increment(self, score: str, games: int) -> None:
+        # Update the running count of games with this score, in memory and in the database
+        self._histogram[score] += games
+        self._connection.execute('UPDATE histogram SET games = games + ? WHERE score = ?', (games, score))
+
+    def _SetToday(self, dayNumber: int, score: str) -> None:
+        self._today = (dayNumber, score)
+
+        with self._connection:
+            self._connection.execute('INSERT OR REPLACE INTO today (id, dayNumber, score) VALUES (0, ?, ?)', self._today)
+
+    def Record(self, results: list[GameResult], todaysResult: Optional[GameResult] = None) -> None:
+        # Add the results in one transaction, a day already recorded has its result replaced
+        with self._lock:
+            with self._connection:
+                for result in results:
+                    previous = self._connection.execute('SELECT score FROM results WHERE dayNumber = ?', (result.dayNumber,)).fetchone()
+
+                    if previous is not None:
+                        self._Increment(previous[0], -1)
+
+                    self._connection.execute('INSERT OR REPLACE INTO results (dayNumber, score, guesses) VALUES (?, ?, ?)', (result.dayNumber, result.guessNumberString, ','.join(result.guesses)))
+                    self._Increment(result.guessNumberString, 1)
+
+            # Remember today's game for the readme and the distribution image
+            if todaysResult is not None:
+                self._SetToday(todaysResult.dayNumber, todaysResult.guessNumberString)
+
+    @property
+    def gameCount(self) -> int:
+        return sum(self._histogram.values())
+
+    @property
+    def averageScore(self) -> float:
+        # The average number of guesses over the games where the word was found
+        solvedGames = sum(self._histogram[score] for score in SCORES[:-1])
+        guessSum = sum(int(score) * self._histogram[score] for score in SCORES[:-1])
+
+        return guessSum / solvedGames if solvedGames else 0.0
+
+    def Counts(self) -> dict[str, int]:
+        # The number of games with each score
+        return dict(self._histogram)
+
+    @property
+    def todaysScore(self) -> Optional[str]:
+        return self._today[1] if self._today is not None else None
+
+    def Close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,80 @@
+import asyncio
+from collections import OrderedDict
+from datetime import date
+import threading
+from typing import Optional
+
+import aiohttp
+
+from WordList.DownloadWords import WordDownloader
+from WordList.GameResult import GameResult
+from WordList.GuessCache import GuessCache
+from WordList.StageProfiler import StageProfiler
+from WordList.WordList import Words
+from WordList.WordSnapshot import WordSnapshot
+import WordList.Constants as Constants
+
+class SolverService:
+    def __init__(self, guessCache: Optional[GuessCache] = None) -> None:
+        # Share the guess cache between every solve
+        self._guessCache = guessCache
+
+        # Only one refresh may swap the snapshot at a time, solves never wait for it
+        self._refreshLock = threading.Lock()
+
+        # Start from the words already on disk, a refresh will bring them up to date
+        self._snapshot = WordSnapshot.FromDownloader(WordDownloader(downloadWords=False))
+
+        # Remember the results of recent solves, with the snapshot each was solved against
+        self._results: OrderedDict[date, tuple[WordSnapshot, GameResult]] = OrderedDict()
+        self._resultsLock = threading.Lock()
+
+    @property
+    def snapshot(self) -> WordSnapshot:
+        return self._snapshot
+
+    def Solve(self, wordDate: date = date.today(), profiler: Optional[StageProfiler] = None) -> GameResult:
+        # Take the current snapshot once so a refresh part way through does not affect this solve
+        snapshot = self._snapshot
+
+        # Return the result from an earlier solve of this date if it used the same words, no stages are timed for it
+        with self._resultsLock:
+            if wordDate in self._results and self._results[wordDate][0] is snapshot:
+                self._results.move_to_end(wordDate)
+                return self._results[wordDate][1]
+
+        result = Words(guessCache=self._guessCache, wordSnapshot=snapshot, profiler=profiler).Solve(wordDate=wordDate)
+
+        # Keep the result, forgetting the least recently used once over the limit
+        with self._resultsLock:
+            self._results[wordDate] = (snapshot, result)
+            self._results.move_to_end(wordDate)
+
+            while len(self._results) > Constants.SOLVER_RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+
+        return result
+
+    def Update(self, wd: WordDownloader) -> bool:
+        # Swap in a snapshot of the downloader's words if they have changed, returning whether they did
+        with self._refreshLock:
+            if self._snapshot.Matches(wd):
+                return False
+
+            # Build the new snapshot in full before replacing the reference so solves only ever see a complete one
+            self._snapshot = WordSnapshot.FromDownloader(wd)
+
+        print(f'Solver words updated to {wd.sourceHash or "defaults"}')
+
+        return True
+
+    def Refresh(self) -> bool:
+        # Download the words, blocking until done
+        return self.Update(WordDownloader())
+
+    async def RefreshAsync(self, session: aiohttp.ClientSession) -> bool:
+        # Download the words without blocking the event loop, then index any new ones on a worker thread
+        wd = WordDownloader(downloadWords=False)
+        await wd.DownloadWordsAsync(session)
+
+        return await asyncio.to_thread(self.Update, wd)
@@ -0,0 +1,72 @@
+from contextlib import contextmanager
+import time
+from typing import Callable, Iterator, Optional
+
+# The stages of a solve, in the order they happen
+STAGES = ['date', 'counting', 'scoring', 'sorting', 'feedback', 'filtering']
+
+class StageProfiler:
+    def __init__(self, callback: Optional[Callable[[str, float], None]] = None) -> None:
+        # The total wall time in seconds and the number of calls of each stage
+        self.seconds: dict[str, float] = {stage: 0.0 for stage in STAGES}
+        self.calls: dict[str, int] = {stage: 0 for stage in STAGES}
+
+        # The number of games recorded, so the totals can be shown per game
+        self.games = 0
+
+        # An optional function called with the stage name and seconds taken after each stage
+        self._callback = callback
+
+    def __getstate__(self) -> dict:
+        # The callback stays in the process it was set in, only the numbers are sent between processes
+        return {'seconds': self.seconds, 'calls': self.calls, 'games': self.games}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._callback = None
+
+    @contextmanager
+    def Stage(self, stage: str) -> Iterator[None]:
+        # Time the code in the with block, adding it to the totals for the stage even if it raises
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+
+            self.seconds[stage] = self.seconds.get(stage, 0.0) + elapsed
+            self.calls[stage] = self.calls.get(stage, 0) + 1
+
+            if self._callback is not None:
+                self._callback(stage, elapsed)
+
+    def EndGame(self) -> None:
+        self.games += 1
+
+    def Merge(self, other: 'StageProfiler') -> None:
+        # Add the numbers from another profiler, for example one for each game of a replay
+        for stage, seconds in other.seconds.items():
+            self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+            self.calls[stage] = self.calls.get(stage, 0) + other.calls[stage]
+
+        self.games += other.games
+
+    @property
+    def totalSeconds(self) -> float:
+        return sum(self.seconds.values())
+
+    def ReportLines(self) -> list[str]:
+        # A line for each stage with its calls, total time, time per game and share of the total
+        totalSeconds = self.totalSeconds
+        games = max(self.games, 1)
+
+        lines = [f'{"Stage":10} {"Calls":>8} {"Total ms":>10} {"ms/game":>9} {"Share":>6}']
+
+        for stage, seconds in self.seconds.items():
+            share = seconds / totalSeconds if totalSeconds else 0.0
+            lines.append(f'{stage:10} {self.calls[stage]:8} {seconds * 1000:10.2f} {seconds * 1000 / games:9.3f} {share:6.1%}')
+
+        lines.append(f'{"total":10} {"":8} {totalSeconds * 1000:10.2f} {totalSeconds * 1000 / games:9.3f} over {self.games} games')
+
+        return lines
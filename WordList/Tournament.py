@@ -0,0 +1,92 @@
+from argparse import ArgumentParser
+from datetime import timedelta
+from functools import partial
+from typing import Callable, Optional
+
+from WordList.DayPool import MapDays
+from WordList.DownloadWords import WordDownloader
+from WordList.Feedback import FeedbackMatrix
+from WordList.ResultsStore import SCORES
+from WordList.WordList import Words
+import WordList.Constants as Constants
+
+class StrategyStats:
+    def __init__(self, strategy: str) -> None:
+        # The name of the scoring method and the number of games with each score
+        self.strategy = strategy
+        self.distribution: dict[str, int] = {score: 0 for score in SCORES}
+
+    def Add(self, guessCount: int, solved: bool) -> None:
+        self.distribution[str(guessCount) if solved else 'X'] += 1
+
+    @property
+    def games(self) -> int:
+        return sum(self.distribution.values())
+
+    @property
+    def failures(self) -> int:
+        return self.distribution['X']
+
+    @property
+    def meanGuesses(self) -> float:
+        # The average number of guesses over the games where the word was found
+        solvedGames = self.games - self.failures
+        guessSum = sum(int(score) * self.distribution[score] for score in SCORES[:-1])
+
+        return guessSum / solvedGames if solvedGames else 0.0
+
+def _CreateTournamentWords(feedbackMatrix: Optional[FeedbackMatrix], registerStrategies: Optional[Callable[[Words], None]]) -> Words:
+    # Share the feedback matrix built by the main process as the pattern cache, then add any extra strategies
+    words = Words(downloadWords=False, feedbackMatrix=feedbackMatrix, expectedRemaining=feedbackMatrix is not None)
+
+    if registerStrategies is not None:
+        registerStrategies(words)
+
+    return words
+
+def _PlayDay(strategies: list[str], words: Words, dayNumber: int) -> list[tuple[int, bool]]:
+    # Play the day with each strategy, only the guess count and whether it was solved are sent back
+    wordDate = Constants.START_DATE + timedelta(days=dayNumber)
+    results = [words.SolveByMethod(strategy, wordDate=wordDate) for strategy in strategies]
+
+    return [(result.guessCount, result.solved) for result in results]
+
+def RunTournament(strategies: Optional[list[str]] = None, registerStrategies: Optional[Callable[[Words], None]] = None, maxWorkers: Optional[int] = None, useFeedbackMatrix: bool = True) -> list[StrategyStats]:
+    # Load the word lists and build the feedback matrix once for the whole tournament
+    wd = WordDownloader(downloadWords=False)
+    feedbackMatrix = FeedbackMatrix.FromWordLists(wd.solutionWords, wd.validWords) if useFeedbackMatrix else None
+
+    # Work out the strategy names in the main process too, so the results can be labelled
+    if strategies is None:
+        strategies = _CreateTournamentWords(feedbackMatrix, registerStrategies).scoringMethodNames
+
+    stats = [StrategyStats(strategy) for strategy in strategies]
+
+    # Play every day with every strategy across the worker processes
+    for dayResults in MapDays(partial(_CreateTournamentWords, feedbackMatrix, registerStrategies), partial(_PlayDay, strategies), len(wd.solutionWords), maxWorkers):
+        for strategyStats, (guessCount, solved) in zip(stats, dayResults):
+            strategyStats.Add(guessCount, solved)
+
+    return stats
+
+def ReportLines(stats: list[StrategyStats]) -> list[str]:
+    # A line for each strategy with its mean, failures and the number of games with each score
+    lines = [f'{"Strategy":40} {"Games":>6} {"Mean":>6} {"Fails":>6} ' + ' '.join(f'{score:>5}' for score in SCORES)]
+
+    for strategyStats in sorted(stats, key=lambda strategyStats: (strategyStats.failures, strategyStats.meanGuesses)):
+        lines.append(f'{strategyStats.strategy:40} {strategyStats.games:6} {strategyStats.meanGuesses:6.3f} {strategyStats.failures:6} ' + ' '.join(f'{strategyStats.distribution[score]:5}' for score in SCORES))
+
+    return lines
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Play every registered strategy over every word in the solution archive')
+    parser.add_argument('strategies', nargs='*', help='names of the scoring methods to play, all of them if none are given')
+    parser.add_argument('--workers', type=int, help='number of worker processes')
+    parser.add_argument('--no-feedback-matrix', action='store_true', help='play without the feedback matrix and its expected remaining strategy')
+    args = parser.parse_args()
+
+    tournamentStats = RunTournament(strategies=args.strategies or None, maxWorkers=args.workers, useFeedbackMatrix=not args.no_feedback_matrix)
+
+    print()
+    for line in ReportLines(tournamentStats):
+        print(line)
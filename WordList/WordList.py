@@ -1,13 +1,24 @@
 from datetime import date, timedelta
 from collections import Counter
-from typing import Callable, Optional
+from contextlib import nullcontext
+import heapq
+from typing import Callable, ContextManager, Optional
+
+import numpy as np
 
 from WordList.DownloadWords import WordDownloader
+from WordList.CandidateIndex import CandidateIndex
+from WordList.Feedback import FeedbackMatrix, FeedbackCode, GraphicToCode, CodeToGraphic
+from WordList.GameResult import GameResult
+from WordList.GuessCache import GuessCache
+from WordList.OpeningBook import OpeningBook
+from WordList.StageProfiler import StageProfiler
+from WordList.WordSnapshot import WordSnapshot
 from WordList.TypeDefs import Word, Letter, WordScores, LetterScores
 import WordList.Constants as Constants
 
 class Words:
-    def __init__(self, downloadWords: bool = True) -> None:
+    def __init__(self, downloadWords: bool = True, feedbackMatrix: Optional[FeedbackMatrix] = None, guessCache: Optional[GuessCache] = None, wordSnapshot: Optional[WordSnapshot] = None, profiler: Optional[StageProfiler] = None, useOpeningBook: bool = True, expectedRemaining: bool = False) -> None:
         # Assume that the date is in bounds
         self.dateOutOfBounds = False
 
@@ -17,36 +28,64 @@ class Words:
         # Set today's word to None
         self.todaysWord: Optional[str] = None
 
-        # Set up a string for the guess number
-        self.guessNumberString: str = '0'
-
-        # Set up a list for the guess history
-        self.guessHistory: list[list[str]] = []
-
         # Get the starting date
         self._startDate = Constants.START_DATE
 
-        # Get the solution and valid words
-        wd = WordDownloader(downloadWords=downloadWords)
+        # Get the solution and valid words, unless a snapshot of them has been shared
+        if wordSnapshot is None:
+            wordSnapshot = WordSnapshot.FromDownloader(WordDownloader(downloadWords=downloadWords))
 
         # Initialise the word lists
-        self._fullWordList: list[Word] = wd.solutionWords
+        self._fullWordList: list[Word] = wordSnapshot.solutionWords
+
+        # Use the snapshot's index so candidates can be filtered with letter masks
+        self._candidateIndex: CandidateIndex = wordSnapshot.candidateIndex
+
+        # Use the snapshot's opening book for the first two guesses of each day, if it has one
+        self._openingBook: Optional[OpeningBook] = wordSnapshot.openingBook if useOpeningBook else None
 
         # Filter out the words that have already gone
         self._remainingWordList: list[str] = []
 
-        # Concatenate the word lists
-        self._letters: str = ''
+        # Track the indices of the remaining words
+        self._remainingIndices: np.ndarray = np.arange(0)
+
+        # Keep running counts of each letter, and each letter in each position, in the remaining words
+        self._letterCounts: np.ndarray = np.zeros(0, dtype=np.int64)
+        self._positionCounts: np.ndarray = np.zeros(0, dtype=np.int64)
 
         # Create counters of each letter
         self._letterCounter: Counter[Letter] = Counter()
 
-        # Using the letter counts to score, score each valid word
-        self._wordScores: WordScores = WordScores()
+        # Using the letter counts to score, score each valid word, keeping the words and their scores in step
+        self._scoredWords: list[Word] = []
+        self._scores: np.ndarray = np.zeros(0, dtype=np.float64)
 
         # Set up the guess number
         self._guessNumber = 0
 
+        # Optionally use a precomputed matrix to look up the guess graphic
+        self._feedbackMatrix = feedbackMatrix
+
+        # Optionally remember the guess chosen for each set of remaining words
+        self._guessCache = guessCache
+
+        # Store the feedback for each guess made today, shared between the scoring methods
+        self._feedback: dict[Word, tuple[list[Letter], list[Letter], str, str, int]] = {}
+
+        # Optionally time each stage of the solve, this can be swapped for another profiler between games
+        self.profiler = profiler
+
+        # Set up the scoring methods to compare, first regardless of letter position then incorporating it
+        self._scoringMethods: list[Callable[[], None]] = [self._CreateWordScores, self._CreateWordScoresByPosition]
+
+        # Only use the expected number of words remaining if asked, it changes the results and is slow on the first round
+        if expectedRemaining:
+            if self._feedbackMatrix is None:
+                raise ValueError('Scoring by expected remaining words needs a feedback matrix')
+
+            self.RegisterScoringMethod(self._CreateWordScoresByExpectedRemaining)
+
     @property
     def fullWordCount(self) -> int:
         return len(self._fullWordList)
@@ -56,7 +95,7 @@ class Words:
         return len(self._remainingWordList)
 
     def _CompileCounts(self) -> None:
-        self._letterCounter = Counter(self._letters)
+        self._letterCounter = Counter({chr(ord('a') + index): count for index, count in enumerate(self._letterCounts.tolist()) if count})
 
     @property
     def soutionLetterCounterByFrequency(self) -> LetterScores:
@@ -66,64 +105,58 @@ class Words:
     def soutionLetterCounterByLetter(self) -> LetterScores:
         return dict(sorted(self._letterCounter.items(), key=lambda x: x[0]))
 
-    def _CreateWordScores(self) -> None:
-        # Clear down the word scores dictionary
-        self._wordScores.clear()
-
-        # Loop through all the solution words
-        for word in self._remainingWordList:
-            # Set the word score to 0 for this word
-            self._wordScores[word] = 0
+    def _TopWordScores(self, count: int) -> WordScores:
+        # Select the highest scoring words without sorting them all, earlier words win any ties
+        return dict(heapq.nlargest(count, zip(self._scoredWords, self._scores.tolist()), key=lambda x: x[1]))
 
-            # Loop through the letters in the word
-            for letter in set(word):
-                # Add the score for this letter to the score for this word
-                self._wordScores[word] += self._letterCounter[letter]
-
-        # Sort the word scores by score, highest to lowest
-        self._wordScores = dict(sorted(self._wordScores.items(), key=lambda x: x[1], reverse=True))
+    def _CreateWordScores(self) -> None:
+        # Score each remaining word using the counts of the distinct letters it contains
+        self._scoredWords = self._remainingWordList
+        self._scores = self._candidateIndex.LetterScores(self._remainingIndices, self._letterCounts)
 
     def _CreateWordScoresByPosition(self) -> None:
-        # Clear down the word scores dictionary
-        self._wordScores.clear()
+        # Score each remaining word using the counts of its letters in the same position
+        self._scoredWords = self._remainingWordList
+        self._scores = self._candidateIndex.PositionScores(self._remainingIndices, self._positionCounts)
 
-        # Create a dictionary of letter -> position -> score
-        letterPositionScores: dict[str, dict[int, int]] ={}
+    def _CreateWordScoresByExpectedRemaining(self) -> None:
+        assert self._feedbackMatrix is not None
 
-        # Iterate over the remaining words
-        for word in self._remainingWordList:
+        # Work out how many words each guess is expected to leave in contention
+        expectedRemaining = self._feedbackMatrix.ExpectedRemaining(self._feedbackMatrix.AnswerColumns(self._remainingWordList))
 
-            # Iterate over the letters in the word
-            for position, letter in enumerate(word):
-                # If this letter has not yet been encountered, create an entry in the dict
-                if letter not in letterPositionScores:
-                    letterPositionScores[letter] = {}
+        # A remaining word may be the answer itself, in which case no words are left
+        remainingRows = self._feedbackMatrix.GuessRows(self._remainingWordList)
+        expectedRemaining[remainingRows] -= 1 / len(self._remainingWordList)
 
-                # If this letter has not yet been seen in this position, create an entry in the dict
-                if position not in letterPositionScores[letter]:
-                    letterPositionScores[letter][position] = 0
+        # Score the remaining words first so they win any ties, then every other word that can be guessed
+        otherRows = np.setdiff1d(np.arange(len(self._feedbackMatrix.guessWords)), remainingRows, assume_unique=True)
 
-                # Increment the count of this letter in this position
-                letterPositionScores[letter][position] += 1
+        self._scoredWords = self._remainingWordList + [self._feedbackMatrix.guessWords[row] for row in otherRows.tolist()]
+        self._scores = -expectedRemaining[np.concatenate((remainingRows, otherRows))]
 
-        # Iterate over the remaining words once more now the scores are known
-        for word in self._remainingWordList:
+    def _Stage(self, stage: str) -> ContextManager[None]:
+        # Time the stage if there is a profiler, otherwise do nothing
+        return self.profiler.Stage(stage) if self.profiler is not None else nullcontext()
 
-            # Set the word score to 0 for this word
-            self._wordScores[word] = 0
+    def _OpeningBookGuess(self, strategy: str, guesses: list[Word]) -> Optional[Word]:
+        if self._openingBook is None:
+            return None
 
-            # Iterate over the letters in the word
-            for position, letter in enumerate(word):
-                self._wordScores[word] += letterPositionScores[letter][position]
+        # The first guess only depends on the day, so look it up directly
+        if not guesses:
+            return self._openingBook.FirstGuess(strategy, self.dayNumber)
 
-        # Sort the word scores by score, highest to lowest
-        self._wordScores = dict(sorted(self._wordScores.items(), key=lambda x: x[1], reverse=True))
+        # The second guess depends on the feedback from the first
+        if len(guesses) == 1:
+            assert self.todaysWord is not None
+            return self._openingBook.SecondGuess(strategy, self.dayNumber, guesses[0], FeedbackCode(guesses[0], self.todaysWord))
 
-    def _GuessWordByMethod(self, scoringMethod: Callable, wordDate: date = date.today() + timedelta(days=Constants.DAY_OFFSET), verbose: bool = False):
-        # Reset the guess number and history
-        self._guessNumber = 0
-        self.guessNumberString = '0'
-        self.guessHistory = []
+        return None
+
+    def _ResolveDate(self, wordDate: date) -> date:
+        # Assume that the date is in bounds
+        self.dateOutOfBounds = False
 
         # Check the date is not before the start date
         if wordDate < self._startDate:
@@ -141,163 +174,264 @@ class Words:
             # Flag the date as out of bounds
             self.dateOutOfBounds = True
 
-        # Print the wordDate for interest
-        print(f'Words:GuessWord():wordDate : {wordDate}')
-
         # Get the day number
         self.dayNumber = (wordDate - self._startDate).days
 
-        # Print the day number for interest
-        print(f'Words:GuessWord():dayNumber: {self.dayNumber}')
-
         # Get today's word
         self.todaysWord = self._fullWordList[self.dayNumber]
 
+        # Clear the feedback from any previous day
+        self._feedback.clear()
+
+        return wordDate
+
+    def _GuessFeedback(self, guess: Word) -> tuple[list[Letter], list[Letter], str, str, int]:
+        # The feedback only depends on the guess, so reuse it if another method has already made this guess
+        if guess in self._feedback:
+            return self._feedback[guess]
+
+        assert self.todaysWord is not None
+
+        # Set up the variables for good and bad letters and letter position tracking
+        goodLetterPositions: list[Letter] = ['_' for _ in range(Constants.MAX_LETTERS)]
+        goodLetters = ''
+        badLetterPositions: list[Letter] = ['_' for _ in range(Constants.MAX_LETTERS)]
+        excludedLetters = ''
+
+        # Create a list for the guess graphic, initialised to all wrong guesses
+        guessGraphic: list[str] = [Constants.INCORRECT_LETTER for _ in range(Constants.MAX_LETTERS)]
+
+        # Loop over the letters in the guess word
+        for count, letter in enumerate(guess):
+            # If the letter is in the correct position, log this and continue
+            if letter == self.todaysWord[count]:
+                goodLetterPositions[count] = letter
+
+                # Set the guess history in this guess line to the In Position character
+                guessGraphic[count] = Constants.LETTER_IN_POSITION
+
+                # Add to the string of good letters
+                goodLetters += letter
+            else:
+                # We know that this letter is not in the correct position
+                goodLetterPositions[count] = '_'
+
+                # If the letter is in the word, but not in the correct position
+                if letter in self.todaysWord:
+                    # State that this letter cannot appear in this position
+                    badLetterPositions[count] = letter
+
+                    # Add to the string of good letters
+                    goodLetters += letter
+
+                    # If there is a feedback matrix the graphic will be looked up once the letters are known
+                    if self._feedbackMatrix is not None:
+                        continue
+
+                    # How many times has the letter been in a good position
+                    timesLetterGood = len([goodPosLetter for goodPosLetter in goodLetterPositions if goodPosLetter == letter])
+
+                    # How many times has the letter been in a bad position
+                    timesLetterBad = len([badPosLetter for badPosLetter in badLetterPositions if badPosLetter == letter])
+
+                    # How many times is this letter in the word?
+                    timesLetterInWord = len([badPosLetter for badPosLetter in self.todaysWord if badPosLetter == letter])
+
+                    if (timesLetterGood + timesLetterBad) <= timesLetterInWord:
+                        # Set the guess history in this guess line to the letter in word character
+                        guessGraphic[count] = Constants.LETTER_IN_WORD
+                else:
+                    # This letter is not in the word, add it to the string of excluded letters
+                    excludedLetters += letter
+
+        # Look up the feedback code if there is a feedback matrix, otherwise encode the graphic
+        code = self._feedbackMatrix.Code(guess, self.todaysWord) if self._feedbackMatrix is not None else GraphicToCode(guessGraphic)
+
+        # Store the feedback for any other methods making the same guess
+        self._feedback[guess] = (goodLetterPositions, badLetterPositions, excludedLetters, goodLetters, code)
+
+        return self._feedback[guess]
+
+    def _ResetCandidates(self) -> None:
         # Filter out the words that have already gone
         self._remainingWordList = self._fullWordList[self.dayNumber:]
+        self._remainingIndices = np.arange(self.dayNumber, len(self._fullWordList))
+
+        # Get the cached counts for the words remaining on this day
+        self._letterCounts, self._positionCounts = self._candidateIndex.FirstRoundCounts(self.dayNumber)
+
+    def _GuessWordByMethod(self, scoringMethod: Callable[[], None], maxGuesses: int = Constants.MAX_GUESSES, verbose: bool = False) -> GameResult:
+        assert self.todaysWord is not None
+
+        # Reset the guess number, and the guesses made and their feedback codes
+        self._guessNumber = 0
+        guesses: list[Word] = []
+        codes: list[int] = []
+
+        # Start with every word from today onwards
+        with self._Stage('filtering'):
+            self._ResetCandidates()
 
         # Set the guess number to 0 and set up an empty guess
         guess = ''
 
-        # Loop over a maximum of six guesses until a match is found
-        while self._guessNumber < Constants.MAX_GUESSES and guess != self.todaysWord:
-            # Concatenate the word lists
-            self._letters = Letter().join(self._remainingWordList)
-
-            # Create counters of each letter
-            self._CompileCounts()
+        # Loop over a maximum of six guesses, or fewer if asked, until a match is found
+        while self._guessNumber < maxGuesses and guess != self.todaysWord:
+            # Look up the opening guesses in the book, unless the scores are to be shown
+            bookGuess = self._OpeningBookGuess(scoringMethod.__name__, guesses) if not verbose else None
 
-            # Using the letter counts to score, score each valid word
-            scoringMethod()
+            # Look up the guess if this method has already chosen between these words, unless the scores are to be shown
+            cacheKey = GuessCache.Key(self._remainingWordList, scoringMethod.__name__) if self._guessCache is not None and bookGuess is None else ''
+            cachedGuess = self._guessCache.Get(cacheKey) if self._guessCache is not None and bookGuess is None and not verbose else None
 
             # Increment the guess number for humans
             self._guessNumber += 1
 
-            # Get the highest scoring remaining word as the guess
-            guess = list(self._wordScores)[0]
+            if bookGuess is not None:
+                # Use the guess from the opening book
+                guess = bookGuess
+            elif cachedGuess is not None:
+                # Use the guess chosen last time
+                guess = cachedGuess
+            else:
+                # Create counters of each letter
+                with self._Stage('counting'):
+                    self._CompileCounts()
+
+                # Using the letter counts to score, score each valid word
+                with self._Stage('scoring'):
+                    scoringMethod()
+
+                # Get the highest scoring word as the guess, the first one found wins any ties
+                with self._Stage('sorting'):
+                    guess = self._scoredWords[int(np.argmax(self._scores))]
+
+                # Remember the guess for next time
+                if self._guessCache is not None:
+                    self._guessCache.Put(cacheKey, guess)
 
             if verbose:
                 # Print the top 10 remaining words
                 print()
-                print(f'Top ten remaining words of {len(self._wordScores)}')
+                print(f'Top ten remaining words of {len(self._scoredWords)}')
                 print()
                 print('===============================')
                 print()
-                for count, (word, score) in enumerate(list(self._wordScores.items())[:10]): print(f'{count + 1:2}) {word} - Score: {score}')
+                for count, (word, score) in enumerate(self._TopWordScores(10).items()): print(f'{count + 1:2}) {word} - Score: {score}')
                 print()
 
-            # Set up the variables for good and bad letters and letter position tracking
-            goodLetterPositions: list[Letter] = ['_' for _ in range(Constants.MAX_LETTERS)]
-            goodLetters = ''
-            badLetterPositions: list[Letter] = ['_' for _ in range(Constants.MAX_LETTERS)]
-            excludedLetters = ''
-
-            # Create a list for the guess graphic, initialised to all wrong guesses
-            guessGraphic: list[str] = [Constants.INCORRECT_LETTER for _ in range(Constants.MAX_LETTERS)]
-
-            # Loop over the letters in the guess word
-            for count, letter in enumerate(guess):
-                # If the letter is in the correct position, log this and continue
-                if letter == self.todaysWord[count]:
-                    goodLetterPositions[count] = letter
-
-                    # Set the guess history in this guess line to the In Position character
-                    guessGraphic[count] = Constants.LETTER_IN_POSITION
-
-                    # Add to the string of good letters
-                    goodLetters += letter
-                else:
-                    # We know that this letter is not in the correct position
-                    goodLetterPositions[count] = '_'
-
-                    # If the letter is in the word, but not in the correct position
-                    if letter in self.todaysWord:
-                        # State that this letter cannot appear in this position
-                        badLetterPositions[count] = letter
-
-                        # How many times has the letter been in a good position
-                        timesLetterGood = len([goodPosLetter for goodPosLetter in goodLetterPositions if goodPosLetter == letter])
-
-                        # How many times has the letter been in a bad position
-                        timesLetterBad = len([badPosLetter for badPosLetter in badLetterPositions if badPosLetter == letter])
-
-                        # How many times is this letter in the word?
-                        timesLetterInWord = len([badPosLetter for badPosLetter in self.todaysWord if badPosLetter == letter])
-
-                        if (timesLetterGood + timesLetterBad) <= timesLetterInWord:
-                            # Set the guess history in this guess line to the letter in word character
-                            guessGraphic[count] = Constants.LETTER_IN_WORD
-
-                        # Add to the string of good letters
-                        goodLetters += letter
-                    else:
-                        # This letter is not in the word, add it to the string of excluded letters
-                        excludedLetters += letter
+            # Get the feedback for this guess
+            with self._Stage('feedback'):
+                goodLetterPositions, badLetterPositions, excludedLetters, goodLetters, code = self._GuessFeedback(guess)
 
-            # Append the guess graphic to the guess history
-            self.guessHistory.append(guessGraphic)
+            # Append the guess and its feedback code to the result
+            guesses.append(guess)
+            codes.append(code)
 
             if verbose:
                 # Print some stats
                 print(f'Guess {self._guessNumber}                      : {" ".join(letter for letter in guess)}')
-                print(f'                               {"".join(guessGraphic)}')
+                print(f'                               {"".join(CodeToGraphic(code))}')
                 print(f'Letters in correct positions : {" ".join(goodLetterPositions)}')
                 print(f'Letters in bad positions     : {" ".join(badLetterPositions)}')
                 print(f'Letters not in word          : {" ".join(excludedLetters)}')
 
-            # Loop over a copy of the words remaining in contention
-            for word in self._wordScores:
-                # If any excluded letters are in this word, remove it from  the list
-                if set(word) & set(excludedLetters):
-                    self._remainingWordList.remove(word)
-                # If there are good letters and they are not a subset of the word set, remove this word from the list
-                elif set(goodLetters) and not set(goodLetters) <= set(word):
-                    self._remainingWordList.remove(word)
-                else:
-                    # Loop over the letters in this word and remove if it does not have letters in known good postions 
-                    # or it has letters in known bad positions
-                    for index, letter in enumerate(word):
-                        if (letter != goodLetterPositions[index] and goodLetterPositions[index] != '_' or
-                            letter == badLetterPositions[index] and badLetterPositions[index] != '_'):
-                            self._remainingWordList.remove(word)
-                            break
+            with self._Stage('filtering'):
+                # Remove the words which do not match the letters, the order of those remaining is kept
+                matches = self._candidateIndex.Matches(self._remainingIndices, goodLetterPositions, badLetterPositions, excludedLetters, goodLetters)
+
+                # Subtract the removed words from the letter counts rather than counting the remaining words again
+                self._candidateIndex.RemoveCounts(self._remainingIndices[~matches], self._letterCounts, self._positionCounts)
+
+                self._remainingIndices = self._remainingIndices[matches]
+                self._remainingWordList = self._candidateIndex.Words(self._remainingIndices)
 
         # Check whether the word was actually guessed
-        if guess != self.todaysWord:
-            # If not return 'X'
-            self.guessNumberString = 'X'
-        else:
-            # If so, return the guess number as a string
-            self.guessNumberString = str(self._guessNumber)
+        result = GameResult(self.dayNumber, self.todaysWord, tuple(guesses), tuple(codes), guess == self.todaysWord, self.dateOutOfBounds)
 
         if verbose:
             # Output the number of guesses it took
             print()
-            print(f'Got the word {guess.upper()} in {self.guessNumberString} attempts')
+            print(f'Got the word {guess.upper()} in {result.guessNumberString} attempts')
             print()
 
-        # Output a Wordle like graphic
-        print()
-        print(f'Wordle {self.dayNumber} {self.guessNumberString}/6')
-        print()
+        return result
 
-        for guessGraphic in self.guessHistory:
-            print(''.join(guessGraphic))
+    def RegisterScoringMethod(self, scoringMethod: Callable[[], None]) -> None:
+        # Add a method to those compared when guessing the word
+        self._scoringMethods.append(scoringMethod)
 
-    def GuessWord(self, wordDate: date = date.today(), verbose: bool = False):
-        # First guess the word using score regardless of letter position
-        self._GuessWordByMethod(self._CreateWordScores, wordDate=wordDate, verbose=verbose)
+    @property
+    def scoringMethodNames(self) -> list[str]:
+        return [scoringMethod.__name__ for scoringMethod in self._scoringMethods]
+
+    def SolveByMethod(self, scoringMethodName: str, wordDate: date = date.today(), maxGuesses: int = Constants.MAX_GUESSES) -> GameResult:
+        # Guess the word with a single registered scoring method, without printing anything
+        scoringMethod = next((scoringMethod for scoringMethod in self._scoringMethods if scoringMethod.__name__ == scoringMethodName), None)
+
+        if scoringMethod is None:
+            raise ValueError(f'No scoring method registered called {scoringMethodName}')
+
+        with self._Stage('date'):
+            self._ResolveDate(wordDate)
+
+        result = self._GuessWordByMethod(scoringMethod, maxGuesses=maxGuesses)
+
+        # Count the game for the per game timings
+        if self.profiler is not None:
+            self.profiler.EndGame()
+
+        return result
+
+    def _GuessWordByAllMethods(self, verbose: bool = False) -> GameResult:
+        # Set up the best result so far
+        best: Optional[GameResult] = None
+
+        # Guess the word with each method in turn
+        for scoringMethod in self._scoringMethods:
+            # Once a method has solved the word, later methods are stopped as soon as they can no longer match it
+            maxGuesses = best.guessCount if best is not None and best.solved else Constants.MAX_GUESSES
+
+            result = self._GuessWordByMethod(scoringMethod, maxGuesses=maxGuesses, verbose=verbose)
+
+            # Select this method if it did at least as well as the best so far
+            if best is None or (result.guessCount <= best.guessCount and (result.solved or not best.solved)):
+                best = result
+
+        # Use the best method for the results
+        assert best is not None
 
-        # Store up the guess number, guess number string and guess history
-        firstGuessNumber = self._guessNumber
-        firstGuessNumberString = self.guessNumberString
-        firtsguessHistory = self.guessHistory
+        # Count the game for the per game timings
+        if self.profiler is not None:
+            self.profiler.EndGame()
+
+        return best
+
+    def Solve(self, wordDate: date = date.today()) -> GameResult:
+        # Guess the word without printing anything, for the bot and batch replays
+        with self._Stage('date'):
+            self._ResolveDate(wordDate)
+
+        return self._GuessWordByAllMethods()
+
+    def GuessWord(self, wordDate: date = date.today(), verbose: bool = False) -> GameResult:
+        # Work out the day and today's word once for all of the methods
+        with self._Stage('date'):
+            wordDate = self._ResolveDate(wordDate)
+
+        # Print the wordDate and day number for interest
+        print(f'Words:GuessWord():wordDate : {wordDate}')
+        print(f'Words:GuessWord():dayNumber: {self.dayNumber}')
+
+        # Guess the word with every method, keeping the best result
+        result = self._GuessWordByAllMethods(verbose=verbose)
+
+        # Output a Wordle like graphic
+        print()
+        print(f'Wordle {result.dayNumber} {result.guessNumberString}/6')
+        print()
 
-        # Now guess the word using the score incorporating the letter positions
-        self._GuessWordByMethod(self._CreateWordScoresByPosition, wordDate=wordDate, verbose=verbose)
+        for graphicLine in result.GraphicLines():
+            print(graphicLine)
 
-        # Select the best method and use that for the results
-        if firstGuessNumber < self._guessNumber:
-            self._guessNumber = firstGuessNumber
-            self.guessNumberString = firstGuessNumberString
-            self.guessHistory = firtsguessHistory
+        return result
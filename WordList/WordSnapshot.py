@@ -0,0 +1,41 @@
+from typing import Any, NoReturn, Optional
+
+import numpy as np
+
+from WordList.CandidateIndex import CandidateIndex
+from WordList.DownloadWords import WordDownloader
+from WordList.OpeningBook import OpeningBook
+from WordList.TypeDefs import Word
+
+class WordSnapshot:
+    # Use slots and refuse changes so one snapshot can be shared by every solve
+    __slots__ = ('solutionWords', 'validWords', 'sourceHash', 'candidateIndex', 'openingBook')
+
+    solutionWords: list[Word]
+    validWords: list[Word]
+    sourceHash: str
+    candidateIndex: CandidateIndex
+    openingBook: Optional[OpeningBook]
+
+    def __init__(self, solutionWords: list[Word], validWords: list[Word], sourceHash: str = '', solutionLetters: Optional[np.ndarray] = None) -> None:
+        # The word lists and the hash of the JS they came from, these lists must not be changed once shared
+        object.__setattr__(self, 'solutionWords', solutionWords)
+        object.__setattr__(self, 'validWords', validWords)
+        object.__setattr__(self, 'sourceHash', sourceHash)
+
+        # Index the solution words up front so no solve has to, straight from the word store's letters if there are any
+        object.__setattr__(self, 'candidateIndex', CandidateIndex.ForWords(solutionWords, solutionLetters))
+
+        # Load the opening guesses for these words, if a book has been built for them
+        object.__setattr__(self, 'openingBook', OpeningBook.Load(solutionWords, validWords))
+
+    def __setattr__(self, name: str, value: Any) -> NoReturn:
+        raise AttributeError(f'WordSnapshot is immutable, cannot set {name}')
+
+    @classmethod
+    def FromDownloader(cls, wd: WordDownloader) -> 'WordSnapshot':
+        return cls(wd.solutionWords, wd.validWords, wd.sourceHash, wd.solutionLetters)
+
+    def Matches(self, wd: WordDownloader) -> bool:
+        # Whether the downloader holds the same words as this snapshot
+        return wd.sourceHash == self.sourceHash and wd.solutionWords == self.solutionWords and wd.validWords == self.validWords
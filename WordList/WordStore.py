@@ -0,0 +1,91 @@
+from functools import cached_property
+import hashlib
+import mmap
+import struct
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from WordList.TypeDefs import Word
+import WordList.Constants as Constants
+
+# The header holds the magic bytes, version, word counts, a checksum of the words and the hash of the JS they came from
+HEADER = struct.Struct('<4sHII16s32s')
+MAGIC = b'WPWS'
+VERSION = 1
+
+def _Checksum(payload: bytes) -> bytes:
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+class WordStore:
+    def __init__(self, wordMap: mmap.mmap, solutionCount: int, validCount: int, sourceHash: str) -> None:
+        # Keep the file mapped, the words are read straight from it
+        self._map = wordMap
+
+        # Store the number of each kind of word and the hash of the JS they came from
+        self.solutionCount = solutionCount
+        self.validCount = validCount
+        self.sourceHash = sourceHash
+
+    @classmethod
+    def Load(cls, filename: Path = Path(Constants.WORD_STORE_FILE)) -> Optional['WordStore']:
+        if not filename.exists():
+            return None
+
+        try:
+            with open(filename, 'rb') as storeFile:
+                wordMap = mmap.mmap(storeFile.fileno(), 0, access=mmap.ACCESS_READ)
+
+            magic, version, solutionCount, validCount, checksum, sourceHash = HEADER.unpack_from(wordMap)
+
+            # Only use the store if it is this version and the words are intact
+            payloadSize = (solutionCount + validCount) * Constants.MAX_LETTERS
+
+            if magic != MAGIC or version != VERSION or len(wordMap) != HEADER.size + payloadSize or _Checksum(wordMap[HEADER.size:]) != checksum:
+                print('Word store is out of date or corrupt, ignoring it')
+                wordMap.close()
+                return None
+        except (OSError, ValueError, struct.error):
+            print('Word store could not be read, ignoring it')
+            return None
+
+        return cls(wordMap, solutionCount, validCount, sourceHash.rstrip(b'\0').decode('ascii'))
+
+    @staticmethod
+    def Save(solutionWords: list[Word], validWords: list[Word], sourceHash: str = '', filename: Path = Path(Constants.WORD_STORE_FILE)) -> None:
+        # Pack the words five bytes at a time, solutions first
+        payload = ''.join(solutionWords + validWords).encode('ascii')
+        header = HEADER.pack(MAGIC, VERSION, len(solutionWords), len(validWords), _Checksum(payload), sourceHash.encode('ascii'))
+
+        try:
+            # Write to a temporary file then replace so a partly written store is never loaded
+            with open(filename.with_suffix('.tmp'), 'wb') as storeFile:
+                storeFile.write(header)
+                storeFile.write(payload)
+
+            filename.with_suffix('.tmp').replace(filename)
+        except OSError:
+            print('Word store could not be saved')
+
+    def _Words(self, start: int, count: int) -> list[Word]:
+        # Decode the words in one go then split them into five letter words
+        letters = self._map[HEADER.size + start * Constants.MAX_LETTERS:HEADER.size + (start + count) * Constants.MAX_LETTERS].decode('ascii')
+
+        return [letters[index:index + Constants.MAX_LETTERS] for index in range(0, len(letters), Constants.MAX_LETTERS)]
+
+    def _Letters(self, start: int, count: int) -> np.ndarray:
+        # View the words as rows of ASCII letters without copying them out of the file
+        return np.frombuffer(self._map, dtype=np.uint8, count=count * Constants.MAX_LETTERS, offset=HEADER.size + start * Constants.MAX_LETTERS).reshape(-1, Constants.MAX_LETTERS)
+
+    @cached_property
+    def solutionWords(self) -> list[Word]:
+        return self._Words(0, self.solutionCount)
+
+    @cached_property
+    def validWords(self) -> list[Word]:
+        return self._Words(self.solutionCount, self.validCount)
+
+    @property
+    def solutionLetters(self) -> np.ndarray:
+        return self._Letters(0, self.solutionCount)
@@ -0,0 +1,196 @@
+from argparse import ArgumentParser
+from datetime import date, datetime, timedelta
+import json
+from pathlib import Path
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+from typing import Callable, Optional
+
+import numpy as np
+
+from WordList.WordList import Words
+from WordList.DownloadWords import WordDownloader
+from WordList.Feedback import FeedbackMatrix
+from WordList.TypeDefs import Letter
+import WordList.Constants as Constants
+from wordlepal import RunCompleteGame
+
+# The guess used to time the feedback and candidate filter stages
+BENCHMARK_GUESS = 'arose'
+
+# The fields compared between runs, all of which are better when lower
+COMPARED_FIELDS = ['p50Ms', 'p99Ms']
+
+def TimeStage(setup: Callable[[int], None], run: Callable[[], object], repeats: int) -> dict[str, float]:
+    # Run the stage once untimed so any caches are warm
+    setup(0)
+    run()
+
+    # Time each call on its own, leaving the setup for the call out of the timing
+    timings: list[float] = []
+
+    for count in range(repeats):
+        setup(count)
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+
+    # Trace one more call to find the peak memory it allocates, kept apart as tracing slows everything down,
+    # this only sees this process so any work done in worker processes is not included
+    setup(0)
+    tracemalloc.start()
+    run()
+    _, peakMemory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'calls': repeats,
+        'opsPerSec': repeats / sum(timings),
+        'p50Ms': float(np.percentile(timings, 50)) * 1000,
+        'p99Ms': float(np.percentile(timings, 99)) * 1000,
+        'peakMemoryKb': peakMemory / 1024,
+    }
+
+def WorkerPeakRssKb() -> float:
+    # The largest peak resident memory of any finished child process, which macOS gives in bytes and Linux in KiB
+    peakRss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+
+    return peakRss / 1024 if sys.platform == 'darwin' else float(peakRss)
+
+def RunBenchmarks(dayCount: int, repeats: int, useFeedbackMatrix: bool, replay: bool) -> dict[str, dict[str, float]]:
+    # Set up the feedback matrix if asked, then a Words object to time the stages with
+    feedbackMatrix: Optional[FeedbackMatrix] = None
+
+    if useFeedbackMatrix:
+        wd = WordDownloader(downloadWords=False)
+        feedbackMatrix = FeedbackMatrix.FromWordLists(wd.solutionWords, wd.validWords)
+
+    words = Words(downloadWords=False, feedbackMatrix=feedbackMatrix, expectedRemaining=feedbackMatrix is not None)
+
+    # Spread the days timed evenly over the archive, the early days having the most words to choose from
+    days = np.linspace(0, words.fullWordCount - 1, dayCount, dtype=int).tolist()
+    wordDates = [Constants.START_DATE + timedelta(days=day) for day in days]
+
+    def StartRound(count: int) -> None:
+        # Resolve the day and reset the candidates to every word from that day onwards
+        words._ResolveDate(wordDates[count % len(wordDates)])
+        words._ResetCandidates()
+        words._CompileCounts()
+
+    # The feedback for the filter and the day for the solve, set by the setup before each call that uses them
+    feedback: tuple[list[Letter], list[Letter], str, str, int]
+    wordDate: date
+
+    def StartFilter(count: int) -> None:
+        nonlocal feedback
+
+        # Work out the feedback for the guess ready for the filter to use
+        StartRound(count)
+        feedback = words._GuessFeedback(BENCHMARK_GUESS)
+
+    def SolveNext(count: int) -> None:
+        nonlocal wordDate
+        wordDate = wordDates[count % len(wordDates)]
+
+    stages: dict[str, dict[str, float]] = {}
+
+    print('Timing CompileCounts')
+    stages['CompileCounts'] = TimeStage(StartRound, words._CompileCounts, repeats)
+
+    print('Timing CreateWordScores')
+    stages['CreateWordScores'] = TimeStage(StartRound, words._CreateWordScores, repeats)
+
+    print('Timing CreateWordScoresByPosition')
+    stages['CreateWordScoresByPosition'] = TimeStage(StartRound, words._CreateWordScoresByPosition, repeats)
+
+    if feedbackMatrix is not None:
+        print('Timing CreateWordScoresByExpectedRemaining')
+        stages['CreateWordScoresByExpectedRemaining'] = TimeStage(StartRound, words._CreateWordScoresByExpectedRemaining, repeats)
+
+    print('Timing GuessFeedback')
+    stages['GuessFeedback'] = TimeStage(StartRound, lambda: words._GuessFeedback(BENCHMARK_GUESS), repeats)
+
+    print('Timing CandidateFilter')
+    stages['CandidateFilter'] = TimeStage(StartFilter, lambda: words._candidateIndex.Matches(words._remainingIndices, *feedback[:4]), repeats)
+
+    print('Timing GuessWord')
+    stages['GuessWord'] = TimeStage(SolveNext, lambda: words.Solve(wordDate=wordDate), repeats)
+
+    if replay:
+        print('Timing RunCompleteGame')
+        stages['RunCompleteGame'] = TimeStage(lambda _: None, lambda: RunCompleteGame(writeFiles=False), 1)
+
+        # The replay runs in worker processes, so also record the peak resident memory of the largest of them
+        stages['RunCompleteGame']['workerPeakRssKb'] = WorkerPeakRssKb()
+
+    return stages
+
+def CompareResults(baseline: dict, current: dict, tolerance: float) -> bool:
+    # Print the change in each stage, returning whether any stage got slower by more than the tolerance
+    regressed = False
+
+    print()
+    print(f'{"Stage":40} {"Field":8} {"Baseline":>10} {"Current":>10} {"Change":>8}')
+
+    for stage, fields in current['stages'].items():
+        if stage not in baseline['stages']:
+            continue
+
+        for field in COMPARED_FIELDS:
+            before = baseline['stages'][stage][field]
+            after = fields[field]
+            change = (after - before) / before if before else 0.0
+
+            # Flag the stages which got slower by more than the tolerance
+            flag = ' <- regression' if change > tolerance else ''
+            regressed |= change > tolerance
+
+            print(f'{stage:40} {field:8} {before:10.3f} {after:10.3f} {change:+8.1%}{flag}')
+
+    return regressed
+
+def Main() -> int:
+    parser = ArgumentParser(description='Time the stages of the solver and save the results as JSON')
+    parser.add_argument('--days', type=int, default=50, help='number of days across the archive to time each stage on')
+    parser.add_argument('--repeats', type=int, default=200, help='number of timed calls of each stage')
+    parser.add_argument('--feedback-matrix', action='store_true', help='use the feedback matrix and time the expected remaining scoring')
+    parser.add_argument('--replay', action='store_true', help='also time a full archive replay with RunCompleteGame')
+    parser.add_argument('--output', type=Path, default=Path('benchmark.json'), help='file to save the results to')
+    parser.add_argument('--compare', type=Path, help='earlier results to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.1, help='fractional slow down allowed before a stage counts as a regression')
+    args = parser.parse_args()
+
+    results = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'settings': {'days': args.days, 'repeats': args.repeats, 'feedbackMatrix': args.feedback_matrix, 'replay': args.replay},
+        'stages': RunBenchmarks(args.days, args.repeats, args.feedback_matrix, args.replay),
+    }
+
+    # Print a summary of each stage, the peak memory is what this process allocated and the worker peak is only timed for the replay
+    print()
+    print(f'{"Stage":40} {"ops/sec":>10} {"p50 ms":>10} {"p99 ms":>10} {"peak KiB":>10} {"worker KiB":>10}')
+
+    for stage, fields in results['stages'].items():
+        workerPeak = f'{fields["workerPeakRssKb"]:10.1f}' if 'workerPeakRssKb' in fields else f'{"-":>10}'
+        print(f'{stage:40} {fields["opsPerSec"]:10.1f} {fields["p50Ms"]:10.3f} {fields["p99Ms"]:10.3f} {fields["peakMemoryKb"]:10.1f} {workerPeak}')
+
+    # Save the results so later runs can be compared with them
+    with open(args.output, 'w', encoding='utf-8') as outputFile:
+        json.dump(results, outputFile, indent=2)
+
+    # Compare with earlier results if asked, failing if any stage has regressed
+    if args.compare is not None:
+        with open(args.compare, 'r', encoding='utf-8') as baselineFile:
+            if CompareResults(json.load(baselineFile), results, args.tolerance):
+                return 1
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(Main())
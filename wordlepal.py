@@ -1,56 +1,69 @@
 from datetime import date, timedelta
-from collections import Counter
+from functools import lru_cache, partial
+from io import BytesIO
 from pathlib import Path
+import threading
+from typing import Optional
 
 from PIL import Image, ImageDraw, ImageFont
 
 from WordList.WordList import Words
+from WordList.DayPool import MapDays
+from WordList.DownloadWords import WordDownloader
+from WordList.Feedback import FeedbackMatrix
+from WordList.GameResult import GameResult
+from WordList.ResultsStore import ResultsStore
+from WordList.StageProfiler import StageProfiler
 import WordList.Constants as Constants
 
-def RunGame(wordDate: date = date.today(), downloadWords: bool = False, writeFiles: bool = False, verbose: bool = False) -> Words:
-    # Create a Words object using the 
-    words = Words(downloadWords=downloadWords)
+# The results store shared by everything in this process, opened when first needed
+_resultsStore: Optional[ResultsStore] = None
 
-    # Guess the word
-    words.GuessWord(wordDate=wordDate, verbose=verbose)
+# Guard the opening of the store so threads using it at the same time do not each open one and import the history twice
+_resultsStoreLock = threading.Lock()
 
-    if writeFiles:
-        # Write the number of guesses to the history file 
-        with open(Path('history.txt'), 'a', encoding='utf-8') as outputFile:
-            outputFile.write(f'{words.guessNumberString}\n')
+def GetResultsStore() -> ResultsStore:
+    global _resultsStore
 
-        # Write out the number of guesses it took today
-        with open(Path('guessesToday.txt'), 'w', encoding='utf-8') as outputFile:
-            outputFile.write(f'{words.guessNumberString}\n')
+    with _resultsStoreLock:
+        if _resultsStore is None:
+            _resultsStore = ResultsStore()
 
-        # Open the history file and get the new average score
-        with open('history.txt', 'r', encoding='utf-8') as inputFile:
-            # Create a list for the guess number history
-            guessNumberHistory = [int(line) for line in inputFile]
+    return _resultsStore
 
-        # Calculate the average score
-        averageScore = sum(guessNumberHistory) / len(guessNumberHistory)
+def WriteStats(newResults: list[GameResult], todaysResult: GameResult, writeReadme: bool = True) -> None:
+    # Record the result of each new game, replacing any earlier result for the same day, and today's game
+    resultsStore = GetResultsStore()
+    resultsStore.Record(newResults, todaysResult)
 
-        # Output the average score
-        print()
-        print(f'Average Score: {averageScore:.2f}')
-        print('===================')
+    # Get the new average score from the running totals
+    averageScore = resultsStore.averageScore
+
+    # Output the average score
+    print()
+    print(f'Average Score: {averageScore:.2f}')
+    print('===================')
 
-        # Get the counts of each score
-        scoreCounts = Counter(guessNumberHistory)
+    # Get the counts of each score
+    scoreCounts = resultsStore.Counts()
 
-        # Update the readme file
+    # The readme is only written when running from a writable checkout, the bot's code directory is read only
+    if not writeReadme:
+        return
+
+    # Update the readme file, a failure to write it does not lose the stats which are already recorded
+    try:
         with open('README.md', 'w') as readmeFile:
             readmeFile.write('[![Python application](https://github.com/schleising/wordle-pal/actions/workflows/python-app.yml/badge.svg)](https://github.com/schleising/wordle-pal/actions/workflows/python-app.yml)\n')
             readmeFile.write('# wordle-pal\n')
             readmeFile.write('## Help with Wordle words\n')
             readmeFile.write('</br>\n')
             readmeFile.write('</br>\n\n')
-            readmeFile.write(f"## Got today's word in {words.guessNumberString} attempts</br>\n")
+            readmeFile.write(f"## Got today's word in {todaysResult.guessNumberString} attempts</br>\n")
+
+            for graphicLine in todaysResult.GraphicLines():
+                readmeFile.write(f'{graphicLine}\\\n')
 
-            for guessGraphic in words.guessHistory:
-                readmeFile.write(f'{"".join(guessGraphic)}\\\n')
-    
             readmeFile.write('</br>\n')
 
             readmeFile.write(f'## Average Number of Guesses: {averageScore:.2f}</br>\n')
@@ -58,7 +71,7 @@ def RunGame(wordDate: date = date.today(), downloadWords: bool = False, writeFil
             readmeFile.write('## Guess Statistics</br>\n')
 
             for count in range(Constants.MAX_GUESSES):
-                readmeFile.write(f'    {count+1}: {scoreCounts.get(count+1, 0)}\n')
+                readmeFile.write(f'    {count+1}: {scoreCounts[str(count+1)]}\n')
 
             readmeFile.write('</br>\n')
             readmeFile.write('</br>\n')
@@ -78,53 +91,94 @@ def RunGame(wordDate: date = date.today(), downloadWords: bool = False, writeFil
             readmeFile.write('</br>\n\n')
 
             readmeFile.write('## Today\'s Word\n')
-            readmeFile.write(f'{words.todaysWord.upper() if words.todaysWord is not None else ""} - Updated {date.today().day:02}-{date.today().month:02}-{date.today().year}\n')
+            readmeFile.write(f'{todaysResult.todaysWord.upper()} - Updated {date.today().day:02}-{date.today().month:02}-{date.today().year}\n')
+    except OSError:
+        print('README.md could not be written')
 
-    return words
+def RunGame(wordDate: date = date.today(), downloadWords: bool = False, writeFiles: bool = False, verbose: bool = False, feedbackMatrix: Optional[FeedbackMatrix] = None) -> GameResult:
+    # Create a Words object using the 
+    words = Words(downloadWords=downloadWords, feedbackMatrix=feedbackMatrix)
 
-def RunCompleteGame() -> None:
-    currentDate = Constants.START_DATE
+    # Guess the word
+    result = words.GuessWord(wordDate=wordDate, verbose=verbose)
 
-    with open(Path('Output.txt'), 'w', encoding='utf-8') as outputFile:
-        while True:
-            words = RunGame(wordDate=currentDate, writeFiles=True)
+    if writeFiles:
+        # Update the history, today's guesses and the readme with this game
+        WriteStats([result], result)
 
-            if words.dateOutOfBounds:
-                break
+    return result
 
-            outputFile.write('===============\n')
-            outputFile.write(f'Wordle {words.dayNumber} {words.guessNumberString}/6\n')
-            outputFile.write('\n')
+def _CreateReplayWords(feedbackMatrix: Optional[FeedbackMatrix]) -> Words:
+    return Words(downloadWords=False, feedbackMatrix=feedbackMatrix)
 
-            # Output a Wordle like graphic
-            for guessGraphic in words.guessHistory:
-                outputFile.write(f"{''.join(guessGraphic)}\n")
+def _ReplayDay(profile: bool, words: Words, dayNumber: int) -> tuple[GameResult, Optional[StageProfiler]]:
+    # Time this day on its own if profiling so the main process gets a breakdown for each game
+    words.profiler = StageProfiler() if profile else None
+
+    # Guess the word for this day without printing anything, the compact result is all that is sent back to the main process
+    return words.Solve(wordDate=Constants.START_DATE + timedelta(days=dayNumber)), words.profiler
 
-            currentDate = currentDate + timedelta(days=1)
+def RunCompleteGame(maxWorkers: Optional[int] = None, writeFiles: bool = True, profiler: Optional[StageProfiler] = None) -> list[GameResult]:
+    # Load the word lists and build the feedback matrix once for the whole replay, it is only used to look up
+    # the feedback so the replay compares the same scoring methods as the bot and its results match /guess
+    wd = WordDownloader(downloadWords=False)
+    feedbackMatrix = FeedbackMatrix.FromWordLists(wd.solutionWords, wd.validWords)
 
-def GenerateDistGraphic() -> Path:
-    with open(Path('history.txt'), 'r', encoding='utf-8') as historyFile:
-        # Create a list for the guess number history
-        guessNumberHistory = [int(line) for line in historyFile]
+    # Replay every day across the worker processes
+    replays = MapDays(partial(_CreateReplayWords, feedbackMatrix), partial(_ReplayDay, profiler is not None), len(wd.solutionWords), maxWorkers)
 
-    with open(Path('guessesToday.txt'), 'r', encoding='utf-8') as guessesFile:
-        # Get today's guess number
-        guessNumberToday = int(guessesFile.read().strip())
+    results = [result for result, _ in replays]
 
-    # Count the number of guesses
-    guessNumberCounter = Counter(guessNumberHistory)
+    # If profiling, add up the stage timings of every game and log them with the slowest games
+    if profiler is not None:
+        gameProfilers = [gameProfiler for _, gameProfiler in replays if gameProfiler is not None]
 
-    # Turn this counter into a scores dict
-    scores = {count+1: guessNumberCounter.get(count+1, 0) for count in range(Constants.MAX_GUESSES)}
+        for gameProfiler in gameProfilers:
+            profiler.Merge(gameProfiler)
+
+        print()
+        print('Replay stage timings')
+        print('====================')
+
+        for line in profiler.ReportLines():
+            print(line)
+
+        print()
 
-    # Create a list to store the individual images which will make up the full image
-    imageList = []
+        for dayNumber, gameProfiler in sorted(enumerate(gameProfilers), key=lambda day: day[1].totalSeconds, reverse=True)[:Constants.PROFILE_SLOWEST_GAMES]:
+            print(f'Slowest: Wordle {dayNumber} {gameProfiler.totalSeconds * 1000:.2f} ms')
 
-    # Create fonts for the text on the image
+    if not writeFiles:
+        return results
+
+    with open(Path('Output.txt'), 'w', encoding='utf-8') as outputFile:
+        for result in results:
+            outputFile.write('===============\n')
+            outputFile.write(f'Wordle {result.dayNumber} {result.guessNumberString}/6\n')
+            outputFile.write('\n')
+
+            # Output a Wordle like graphic
+            for graphicLine in result.GraphicLines():
+                outputFile.write(f'{graphicLine}\n')
+
+    # Update the stats files once with every game, showing the last day as today's game
+    WriteStats(results, results[-1])
+
+    return results
+
+@lru_cache(maxsize=1)
+def _DistFonts() -> tuple[ImageFont.FreeTypeFont, ImageFont.FreeTypeFont]:
+    # Create fonts for the text on the image, loading them once per process
     textFont = ImageFont.truetype('Roboto/Roboto-Black.ttf', 45)
     scoreFont = ImageFont.truetype('Roboto/Roboto-Regular.ttf', 45)
 
-    # Create an image for the guess distribution text and get the drawing context
+    return textFont, scoreFont
+
+@lru_cache(maxsize=1)
+def _DistTitleImage() -> Image.Image:
+    textFont, _ = _DistFonts()
+
+    # Create an image for the guess distribution text and get the drawing context
     gdImage = Image.new('RGB', (Constants.GUESS_DISTRIBUTION_SIZE_X, Constants.GUESS_DISTRIBUTION_SIZE_Y), 'white')
     gdDraw = ImageDraw.Draw(gdImage)
 
@@ -134,52 +188,58 @@ def GenerateDistGraphic() -> Path:
     # Draw the text on the image in the center of the image space
     gdDraw.text(gdAnchorPos, 'GUESS DISTRIBUTION', fill='black', anchor='mm', font=textFont)
 
-    # Append this image to the list
-    imageList.append(gdImage)
+    return gdImage
 
-    # Get the maximum score so we know how long to make the bars
-    maximumCount = max(scores.values())
+@lru_cache(maxsize=Constants.DIST_BAR_CACHE_SIZE)
+def _DistBarImage(score: int, count: int, maximumCount: int, isToday: bool) -> Image.Image:
+    _, scoreFont = _DistFonts()
+
+    # Create the bar image and get the draw context
+    barImage = Image.new('RGB', Constants.BAR_SCORE_SIZE, 'white')
+    barDraw = ImageDraw.Draw(barImage)
 
-    # Loop through the scores creating a bar image for each
-    for score, count in scores.items():
-        # Create the bar image and get the draw context
-        barImage = Image.new('RGB', Constants.BAR_SCORE_SIZE, 'white')
-        barDraw = ImageDraw.Draw(barImage)
+    # Get the score anchor position
+    scoreAnchorPos = (Constants.SCORE_SIZE_X // 2, Constants.SCORE_SIZE_Y // 2)
 
-        # Get the score anchor position
-        scoreAnchorPos = (Constants.SCORE_SIZE_X // 2, Constants.SCORE_SIZE_Y // 2)
+    # Draw the score on the bar image
+    barDraw.text(scoreAnchorPos, str(score), fill='black', anchor='mm', font=scoreFont)
 
-        # Draw the score on the bar image
-        barDraw.text(scoreAnchorPos, str(score), fill='black', anchor='mm', font=scoreFont)
+    # Only draw the bar and count of that score if the score isn't 0
+    if count != 0:
+        # Calculate the length of the bar based on the ratio of count to maximum count
+        barLength = (Constants.BAR_SIZE[0] * count / maximumCount) - 5
 
-        # Only draw the bar and count of that score if the score isn't 0
-        if count != 0:
-            # Calculate the length of the bar based on the ratio of count to maximum count
-            barLength = (Constants.BAR_SIZE[0] * count / maximumCount) - 5
+        # Draw the rectangle in grey or green if it matches today's score
+        fillColour = 'mediumseagreen' if isToday else 'grey'
+        barDraw.rectangle((50, 5, max(barLength + Constants.SCORE_SIZE_X, 50), Constants.BAR_SIZE[1] - 5), fill=fillColour)
 
-            # Draw the rectangle in grey or green if it matches today's score
-            fillColour = 'mediumseagreen' if score == guessNumberToday else 'grey'
-            barDraw.rectangle((50, 5, barLength + Constants.SCORE_SIZE_X, Constants.BAR_SIZE[1] - 5), fill=fillColour)
+        # Get the count for this score as a string
+        countText = str(count)
 
-            # Get the count for this score as a string
-            countText = str(count)
+        # Work out the length of the resultant string
+        countLength = scoreFont.getlength(countText)
 
-            # Work out the length of the resultant string
-            countLength = scoreFont.getlength(countText)
+        # Using this length value, work out where it should be placed
+        countAnchorPos = (barLength + Constants.SCORE_SIZE_X - countLength // 2 - 10, Constants.BAR_SIZE[1] // 2)
 
-            # Using this length value, work out where it should be placed
-            countAnchorPos = (barLength + Constants.SCORE_SIZE_X - countLength // 2 - 10, Constants.BAR_SIZE[1] // 2)
+        # Draw the count onto the right side of the  bar
+        barDraw.text(countAnchorPos, countText, fill='white', anchor='mm', font=scoreFont)
 
-            # Draw the count onto the right side of the  bar
-            barDraw.text(countAnchorPos, countText, fill='white', anchor='mm', font=scoreFont)
+    return barImage
+
+@lru_cache(maxsize=Constants.DIST_IMAGE_CACHE_SIZE)
+def _RenderDistGraphic(counts: tuple[int, ...], guessNumberToday: int) -> bytes:
+    # Get the maximum score so we know how long to make the bars
+    maximumCount = max(counts)
 
-        # Add this image to the list
-        imageList.append(barImage)
+    # Create a list of the individual images which will make up the full image, reusing any already drawn
+    imageList = [_DistTitleImage()]
+    imageList.extend(_DistBarImage(score, count, maximumCount, score == guessNumberToday) for score, count in enumerate(counts, start=1))
 
     # Create a full image to paste the individual images into
     fullImage = Image.new('RGB', Constants.FULL_IMAGE_SIZE, 'white')
 
-    # Get the height each image can take up and the halfway point
+    # Get the height each image can take up and the halfway point
     imageBoxHeight = Constants.FULL_IMAGE_SIZE[1] // len(imageList)
     imageBoxCentrePoint = imageBoxHeight // 2
 
@@ -194,12 +254,25 @@ def GenerateDistGraphic() -> Path:
         # Paste the image in
         fullImage.paste(image, (imageLeft, imageTop, imageRight, imageBottom))
 
-    # Save the image
-    filename = Path('GuessDistribution.png')
-    fullImage.save(filename, 'PNG')
+    # Save the image in memory
+    imageBytes = BytesIO()
+    fullImage.save(imageBytes, 'PNG')
+
+    return imageBytes.getvalue()
+
+def GenerateDistGraphic() -> BytesIO:
+    resultsStore = GetResultsStore()
+
+    # Get today's guess number, no bar is highlighted if the word was not found
+    todaysScore = resultsStore.todaysScore
+    guessNumberToday = int(todaysScore) if todaysScore is not None and todaysScore != 'X' else 0
+
+    # Get the count of each score from the running totals
+    scoreCounts = resultsStore.Counts()
+    counts = tuple(scoreCounts[str(count+1)] for count in range(Constants.MAX_GUESSES))
 
-    # Return the image as bytes
-    return filename
+    # Return the image, only drawing it if these counts and today's score have not been seen before
+    return BytesIO(_RenderDistGraphic(counts, guessNumberToday))
 
 if __name__ == '__main__':
     RunGame(downloadWords=True, writeFiles=True, verbose=True)
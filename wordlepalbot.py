@@ -1,8 +1,12 @@
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import json
 import re
 import sys
 from typing import Any
-from datetime import date
+from datetime import date, time, timedelta
 import logging
 from pathlib import Path
 from urllib.parse import urlencode, urlparse
@@ -12,23 +16,72 @@ import aiohttp
 
 from dateparser import parse
 
-from telegram import Update
+from telegram import Message, Update
 from telegram.constants import ParseMode
 from telegram.error import BadRequest
-from telegram.ext import ApplicationBuilder, CommandHandler, CallbackContext
+from telegram.ext import Application, ApplicationBuilder, CommandHandler, CallbackContext
 
 from bs4 import BeautifulSoup
 
 from simple_openai import AsyncSimpleOpenai
 from simple_openai.models import open_ai_models
 
-from WordList.WordList import Words
-from wordlepal import RunGame, GenerateDistGraphic
+from WordList.GameResult import GameResult
+from WordList.GuessCache import GuessCache
+from WordList.SolverService import SolverService
+from WordList.StageProfiler import StageProfiler
+import WordList.Constants as Constants
+from wordlepal import WriteStats, GenerateDistGraphic
 
 FOOTBALL_API_BASE_URL = "https://www.schleising.net"
 FOOTBALL_API_HISTORY_QUERY_URL = "/football/api/history/query/"
 SERPAPI_SEARCH_URL = "https://serpapi.com/search.json"
 
+# Run the daily precompute just after the words change over, the job queue works in UTC
+DAILY_PRECOMPUTE_TIME = time(hour=0, minute=5)
+
+# Wait a moment after starting before the first word refresh, a job due before the job queue starts is skipped
+WORD_REFRESH_FIRST_DELAY = 5
+
+# The longest message sent for a /gpt reply and the placeholder shown until it is written
+GPT_CHUNK_SIZE = 3072
+GPT_PLACEHOLDER = "..."
+
+# Limits for the shared HTTP connection pool used by the tools
+HTTP_CONNECTION_LIMIT = 32
+HTTP_CONNECTION_LIMIT_PER_HOST = 4
+HTTP_DNS_CACHE_SECONDS = 300
+HTTP_KEEPALIVE_SECONDS = 60
+
+# Default timeouts for every tool request, a request can override these
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=30, connect=10, sock_read=20)
+
+# How long search results are reused for and how many are kept
+SEARCH_CACHE_TTL = 15 * 60
+SEARCH_CACHE_MAX_ENTRIES = 256
+
+# How long fetched pages are kept and how many, and the most of each page that is read
+PAGE_CACHE_TTL = 6 * 60 * 60
+PAGE_CACHE_MAX_ENTRIES = 128
+PAGE_MAX_BYTES = 2 * 1024 * 1024
+PAGE_CHUNK_BYTES = 64 * 1024
+
+# The most links fetched by one get_links call, how many are fetched from one host at once and the total size returned
+GET_LINKS_MAX_LINKS = 6
+GET_LINKS_PER_HOST = 2
+GET_LINKS_MAX_BYTES = 24 * 1024
+
+# The headers sent when fetching a page
+PAGE_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/133.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-GB,en;q=0.9",
+}
+
 VALID_CHAT_IDS = [
     -709419375, # Test chat
     -417681459, # Tim and Dean
@@ -49,6 +102,56 @@ else:
     last_dalle_requests: dict[str, str] = {}
     print("No last dalle requests found")
 
+# Remember the guesses chosen for each set of remaining words, persisting them if storage is available
+guess_cache = GuessCache(
+    storage_path / "guess_cache.json" if storage_path.exists() else None
+)
+
+# Keep one solver for the whole process, holding a snapshot of the word lists which is refreshed in the background
+solver_service = SolverService(guessCache=guess_cache)
+
+# Solve the words on worker threads so the event loop stays free for other commands
+solver_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="solver")
+
+# Remember recent search results so repeated queries skip SerpApi, persisting them if storage is available
+search_cache = GuessCache(
+    storage_path / "search_cache.json" if storage_path.exists() else None,
+    maxEntries=SEARCH_CACHE_MAX_ENTRIES,
+    ttl=SEARCH_CACHE_TTL,
+)
+
+# Remember the text extracted from recently fetched pages along with their validators
+page_cache = GuessCache(maxEntries=PAGE_CACHE_MAX_ENTRIES, ttl=PAGE_CACHE_TTL)
+
+# One HTTP session for the life of the bot so tool calls reuse connections, created at startup
+http_session: aiohttp.ClientSession | None = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    global http_session
+
+    # Create the session if the bot has not started it yet or it has been closed
+    if http_session is None or http_session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_CONNECTION_LIMIT,
+            limit_per_host=HTTP_CONNECTION_LIMIT_PER_HOST,
+            ttl_dns_cache=HTTP_DNS_CACHE_SECONDS,
+            keepalive_timeout=HTTP_KEEPALIVE_SECONDS,
+        )
+        http_session = aiohttp.ClientSession(connector=connector, timeout=HTTP_TIMEOUT)
+
+    return http_session
+
+
+def solve_word(wordDate: date, profiler: StageProfiler | None = None) -> GameResult:
+    # Solve against the current snapshot of the word lists
+    result = solver_service.Solve(wordDate=wordDate, profiler=profiler)
+
+    # Save any new guesses so they survive a restart
+    guess_cache.Save()
+
+    return result
+
 
 # Function to check that the request comes from a valid chat
 def is_valid_chat(update: Update) -> bool:
@@ -108,28 +211,34 @@ async def guess(update: Update, context):
             # If no date is given use today's date
             wordDate = date.today()
 
-        # Guess the word returning the day number and guess history for the response
-        words = Words()
-        words.GuessWord(wordDate=wordDate)
+        # Time the stages of the solve if profiling is turned on
+        profiler = StageProfiler() if Constants.PROFILE_SOLVER else None
 
-        # If the date is in bounds
-        if not words.dateOutOfBounds:
-            # Join the guess history lines into strings
-            guessStrings = [
-                "".join(guessGraphic) for guessGraphic in words.guessHistory
-            ]
+        # Guess the word on the solver thread returning the day number and guess history for the response
+        result = await asyncio.get_running_loop().run_in_executor(
+            solver_executor, solve_word, wordDate, profiler
+        )
+
+        # Log where the time went, a result from the solver's cache will not have been timed
+        if profiler is not None and profiler.games > 0:
+            print(f"Stage timings for Wordle {result.dayNumber}")
+
+            for line in profiler.ReportLines():
+                print(line)
 
+        # If the date is in bounds
+        if not result.dateOutOfBounds:
             # Create a list for the output text
             msgLines: list[str] = []
 
             # Add the first line of text which shows how many guesses it took
-            msgLines.append(f"Wordle {words.dayNumber} {words.guessNumberString}/6")
+            msgLines.append(f"Wordle {result.dayNumber} {result.guessNumberString}/6")
 
             # Add a blank line
             msgLines.append("")
 
             # Add the guess history strings
-            msgLines.extend(guessStrings)
+            msgLines.extend(result.GraphicLines())
 
             # Send the reply removing the quote of the original /guess message
             await update.message.reply_text("\n".join(msgLines), do_quote=False)
@@ -139,22 +248,38 @@ async def guess(update: Update, context):
 
 
 async def RunGameHandler(context: CallbackContext) -> None:
-    # Run the game once a day to update the stats
-    RunGame(wordDate=date.today(), downloadWords=True, writeFiles=True, verbose=True)
+    # Refresh the word lists so today's and tomorrow's words are solved against the latest ones, using the shared session
+    await solver_service.RefreshAsync(get_http_session())
+
+    # Solve today's and tomorrow's words so the first /guess of the day is a lookup
+    loop = asyncio.get_running_loop()
+    todays_result = await loop.run_in_executor(solver_executor, solve_word, date.today())
+    await loop.run_in_executor(solver_executor, solve_word, date.today() + timedelta(days=1))
+
+    # Record today's game in the stats store, the readme lives in the read only code directory so is not written,
+    # then render the guess distribution image once for the day from the updated counts
+    await loop.run_in_executor(solver_executor, partial(WriteStats, [todays_result], todays_result, writeReadme=False))
+    await loop.run_in_executor(solver_executor, GenerateDistGraphic)
+
+    print(f"Daily precompute done for Wordle {todays_result.dayNumber}")
 
 
 async def dist(update: Update, context):
-    # Generate the image and return it without a quote
-    with open(GenerateDistGraphic(), "rb") as imageFile:
-        if update.message is not None:
-            # Check the request comes from a valid chat
-            if not is_valid_chat(update):
-                await update.message.reply_text(
-                    "Sorry, this command is not available in this chat", do_quote=False
-                )
-                return
+    if update.message is not None:
+        # Check the request comes from a valid chat
+        if not is_valid_chat(update):
+            await update.message.reply_text(
+                "Sorry, this command is not available in this chat", do_quote=False
+            )
+            return
 
-            await update.message.reply_photo(imageFile, do_quote=False)
+        # Get the image, which is only drawn if the stats have changed since it was last drawn
+        dist_image = await asyncio.get_running_loop().run_in_executor(
+            solver_executor, GenerateDistGraphic
+        )
+
+        # Return the image without a quote
+        await update.message.reply_photo(dist_image, do_quote=False)
 
 
 async def image(update: Update, context):
@@ -177,6 +302,75 @@ async def image(update: Update, context):
         )
 
 
+class StreamingReply:
+    def __init__(self, message: Message) -> None:
+        # The message being replied to, the reply message being written and the text for it
+        self._message = message
+        self._reply: Message | None = None
+        self._text = ""
+
+        # Once Telegram rejects the Markdown in a chunk the rest are sent as plain text
+        self._use_markdown = True
+
+    async def start(self) -> None:
+        # Send the placeholder, quoting the request
+        self._reply = await self._message.reply_text(GPT_PLACEHOLDER, do_quote=True)
+
+    async def append(self, text: str) -> None:
+        # The client returns the response whole, so the text is only shown once each chunk of it is complete
+        self._text += text
+
+        # Fill the reply up to the chunk size, moving on to a new message for the rest
+        while len(self._text) > GPT_CHUNK_SIZE:
+            # Break at the last newline before the limit, or the last space, or at the limit if there is neither
+            split_index = self._text.rfind("\n", 0, GPT_CHUNK_SIZE)
+
+            if split_index <= 0:
+                split_index = self._text.rfind(" ", 0, GPT_CHUNK_SIZE)
+
+                if split_index <= 0:
+                    split_index = GPT_CHUNK_SIZE
+
+            rest = self._text[split_index:].lstrip()
+            self._text = self._text[:split_index]
+
+            # Finish this chunk, then start a new message without a quote for the rest
+            await self._show()
+
+            assert self._reply is not None
+            self._reply = await self._reply.reply_text(GPT_PLACEHOLDER, do_quote=False)
+            self._text = rest
+
+    async def finish(self) -> None:
+        await self._show()
+
+    async def fail(self, text: str) -> None:
+        # Replace the reply with the error message
+        self._use_markdown = False
+        self._text = text
+        await self._show()
+
+    async def _show(self) -> None:
+        assert self._reply is not None
+
+        # Telegram rejects empty messages
+        if not self._text.strip():
+            return
+
+        try:
+            if self._use_markdown:
+                await self._reply.edit_text(self._text, parse_mode=ParseMode.MARKDOWN)
+            else:
+                await self._reply.edit_text(self._text)
+        except BadRequest as exc:
+            if self._use_markdown and "Can't parse entities" in str(exc):
+                print("Telegram markdown parse failed, retrying as plain text")
+                self._use_markdown = False
+                await self._reply.edit_text(self._text)
+            elif "Message is not modified" not in str(exc):
+                raise
+
+
 async def gpt(update: Update, context):
     # Check all the required data is available
     if (
@@ -206,82 +400,40 @@ async def gpt(update: Update, context):
         )
         print(f"Request: {input_text}")
 
-        # Send the request to the OpenAI API
-        response = await simple_openai_client.get_chat_response(
-            input_text,
-            name,
-            str(update.message.chat.id),
-            max_tool_calls=2,
-            add_date_time=True,
-        )
+        # Show a placeholder straight away, the response is written into it once it arrives
+        reply = StreamingReply(update.message)
+        await reply.start()
+
+        # Send the request to the OpenAI API, replacing the placeholder with the error if the request fails
+        try:
+            response = await simple_openai_client.get_chat_response(
+                input_text,
+                name,
+                str(update.message.chat.id),
+                max_tool_calls=2,
+                add_date_time=True,
+            )
+        except Exception as exc:
+            # Log the error and let the user know, rather than leaving the placeholder showing
+            print(f"Error: {exc!r}")
+            await reply.fail(f"There was a problem...\n\n{exc!r}")
+            return
 
         # Check the response is valid
         if response.success:
             # Log the response
             print(f"Response: {response.message}")
 
-            # Split into chunks of 3072 characters or less, breaking at newlines to avoid cutting sentences in half
-            chunks = []
-            message = response.message
-            while len(message) > 0:
-                if len(message) <= 3072:
-                    chunks.append(message)
-                    break
-                else:
-                    # Find the last newline before the 3072 character limit
-                    split_index = message.rfind("\n", 0, 3072)
-
-                    if split_index == -1:
-                        # If there is no newline, split at the last space
-                        split_index = message.rfind(" ", 0, 3072)
-
-                        if split_index == -1:
-                            # If there is no space, split at 3072 characters
-                            split_index = 3072
-
-                    # Add the chunk to the list
-                    chunks.append(message[:split_index])
-
-                    # Remove the chunk from the message
-                    message = message[split_index:].lstrip()
-
-            # Send the response to the user
-            first_chunk = True
-            use_markdown = True
-
-            for chunk in chunks:
-                # Send each chunk, quoting only the first one.
-                # If Telegram rejects Markdown entities, fall back to plain text.
-                try:
-                    if use_markdown:
-                        await update.message.reply_text(
-                            chunk,
-                            do_quote=first_chunk,
-                            parse_mode=ParseMode.MARKDOWN,
-                        )
-                    else:
-                        await update.message.reply_text(chunk, do_quote=first_chunk)
-                except BadRequest as exc:
-                    if use_markdown and "Can't parse entities" in str(exc):
-                        print(
-                            "Telegram markdown parse failed, retrying as plain text"
-                        )
-                        await update.message.reply_text(chunk, do_quote=first_chunk)
-                        use_markdown = False
-                    else:
-                        raise
-
-                # Set first_chunk to False after the first iteration
-                first_chunk = False
+            # Write the response into the reply, the client returns it whole so it arrives as one piece
+            await reply.append(response.message)
+            await reply.finish()
 
         else:
             # Log the error
             print(f"Error: {response.message}")
 
             # If the response is invalid, let the user know
-            await update.message.reply_text(
-                f"There was a problem...\n\n{response.message}", do_quote=False
-            )
+            await reply.fail(f"There was a problem...\n\n{response.message}")
 
 
 async def dalle(update: Update, context):
@@ -472,59 +624,54 @@ async def query_football(request: dict[str, Any]) -> str:
         "Authorization": f"Bearer {football_api_key}",
     }
 
-    timeout = aiohttp.ClientTimeout(total=30)
-
     try:
-        async with aiohttp.ClientSession(
+        # Use the shared session so repeated queries reuse the connection
+        async with get_http_session().post(
+            f"{FOOTBALL_API_BASE_URL}{FOOTBALL_API_HISTORY_QUERY_URL}",
             headers=headers,
-            base_url=FOOTBALL_API_BASE_URL,
-            timeout=timeout,
-        ) as session:
-            async with session.post(
-                FOOTBALL_API_HISTORY_QUERY_URL,
-                json={"request": request},
-            ) as response:
-                if response.status == 200:
-                    try:
-                        response_json = await response.json(content_type=None)
-                        content = json.dumps(response_json, ensure_ascii=True)
-                    except (ValueError, json.JSONDecodeError):
-                        content = json.dumps(
-                            {
-                                "ok": True,
-                                "raw_response": await response.text(),
-                            },
-                            ensure_ascii=True,
-                        )
-
-                    print("Got football response")
-                    pretty_log_json(content, "Football query response")
-                else:
-                    error_message = f"HTTP {response.status}"
-
-                    try:
-                        error_payload = await response.json(content_type=None)
-                        if isinstance(error_payload, dict):
-                            api_message = str(error_payload.get("error", "")).strip()
-                            if api_message:
-                                error_message = f"HTTP {response.status}: {api_message}"
-                    except (ValueError, json.JSONDecodeError):
-                        raw_error = (await response.text()).strip()
-                        if raw_error:
-                            error_message = (
-                                f"HTTP {response.status}: {raw_error[:400]}"
-                            )
-
+            json={"request": request},
+        ) as response:
+            if response.status == 200:
+                try:
+                    response_json = await response.json(content_type=None)
+                    content = json.dumps(response_json, ensure_ascii=True)
+                except (ValueError, json.JSONDecodeError):
                     content = json.dumps(
                         {
-                            "ok": False,
-                            "error": error_message,
+                            "ok": True,
+                            "raw_response": await response.text(),
                         },
                         ensure_ascii=True,
                     )
 
-                    print(f"Football API returned an error: {error_message}")
-                    pretty_log_json(content, "Football query error response")
+                print("Got football response")
+                pretty_log_json(content, "Football query response")
+            else:
+                error_message = f"HTTP {response.status}"
+
+                try:
+                    error_payload = await response.json(content_type=None)
+                    if isinstance(error_payload, dict):
+                        api_message = str(error_payload.get("error", "")).strip()
+                        if api_message:
+                            error_message = f"HTTP {response.status}: {api_message}"
+                except (ValueError, json.JSONDecodeError):
+                    raw_error = (await response.text()).strip()
+                    if raw_error:
+                        error_message = (
+                            f"HTTP {response.status}: {raw_error[:400]}"
+                        )
+
+                content = json.dumps(
+                    {
+                        "ok": False,
+                        "error": error_message,
+                    },
+                    ensure_ascii=True,
+                )
+
+                print(f"Football API returned an error: {error_message}")
+                pretty_log_json(content, "Football query error response")
     except aiohttp.ClientError as exc:
         content = json.dumps(
             {
@@ -588,6 +735,21 @@ async def search(query: str) -> str:
         "num": "10",
     }
 
+    # Return the ranked results from an earlier search for the same query and region if they are recent enough
+    cache_key = json.dumps(
+        [
+            " ".join(clean_query.lower().split()),
+            request_params["gl"],
+            request_params["hl"],
+            request_params["location"],
+        ]
+    )
+    cached_content = search_cache.Get(cache_key)
+
+    if cached_content is not None:
+        print(f"Using cached search results for {clean_query}")
+        return cached_content
+
     # Print a redacted URL that matches the real request params.
     redacted_params = dict(request_params)
     redacted_params["api_key"] = "[redacted]"
@@ -615,149 +777,154 @@ async def search(query: str) -> str:
             return 1
         return 0
 
-    # Open a session
+    # Send the request on the shared session
     try:
-        async with aiohttp.ClientSession(headers=headers, timeout=timeout) as session:
-            # Send the request
-            async with session.get(SERPAPI_SEARCH_URL, params=request_params) as response:
-                # Check the status code
-                if response.status == 200:
-                    # Get the response content
-                    response_json = await response.json(content_type=None)
-
-                    # SerpApi can return error payloads with HTTP 200.
-                    if isinstance(response_json, dict) and response_json.get("error"):
-                        content = json.dumps(
-                            {
-                                "ok": False,
-                                "query": clean_query,
-                                "error": str(response_json.get("error", "unknown SerpApi error")),
-                                "results": [],
-                            },
-                            ensure_ascii=True,
-                        )
-                        pretty_log_json(content, "SerpApi returned an error")
-                        return content
-
-                    # Collect result candidates from multiple SerpApi sections.
-                    organic_results = response_json.get("organic_results", [])
-                    news_results = response_json.get("news_results", [])
-                    items = organic_results + news_results
-
-                    # Filter and score results.
-                    filtered_items = []
-                    seen_links: set[str] = set()
-                    for item in items:
-                        link = item.get("link", "").strip()
-                        title = compact_text(item.get("title", ""), limit=180)
-                        snippet_source = item.get("snippet", "")
-                        if not snippet_source:
-                            highlights = item.get("snippet_highlighted_words", [])
-                            if isinstance(highlights, list):
-                                snippet_source = " ".join(str(word) for word in highlights)
-                            else:
-                                snippet_source = str(highlights)
-                        snippet = compact_text(
-                            str(snippet_source),
-                            limit=320,
-                        )
+        async with get_http_session().get(
+            SERPAPI_SEARCH_URL, params=request_params, headers=headers, timeout=timeout
+        ) as response:
+            # Check the status code
+            if response.status == 200:
+                # Get the response content
+                response_json = await response.json(content_type=None)
 
-                        if not link.startswith("http"):
-                            continue
+                # SerpApi can return error payloads with HTTP 200.
+                if isinstance(response_json, dict) and response_json.get("error"):
+                    content = json.dumps(
+                        {
+                            "ok": False,
+                            "query": clean_query,
+                            "error": str(response_json.get("error", "unknown SerpApi error")),
+                            "results": [],
+                        },
+                        ensure_ascii=True,
+                    )
+                    pretty_log_json(content, "SerpApi returned an error")
+                    return content
+
+                # Collect result candidates from multiple SerpApi sections.
+                organic_results = response_json.get("organic_results", [])
+                news_results = response_json.get("news_results", [])
+                items = organic_results + news_results
+
+                # Filter and score results.
+                filtered_items = []
+                seen_links: set[str] = set()
+                for item in items:
+                    link = item.get("link", "").strip()
+                    title = compact_text(item.get("title", ""), limit=180)
+                    snippet_source = item.get("snippet", "")
+                    if not snippet_source:
+                        highlights = item.get("snippet_highlighted_words", [])
+                        if isinstance(highlights, list):
+                            snippet_source = " ".join(str(word) for word in highlights)
+                        else:
+                            snippet_source = str(highlights)
+                    snippet = compact_text(
+                        str(snippet_source),
+                        limit=320,
+                    )
 
-                        if link.lower().endswith(".pdf"):
-                            continue
+                    if not link.startswith("http"):
+                        continue
 
-                        if link in seen_links:
-                            continue
-                        seen_links.add(link)
+                    if link.lower().endswith(".pdf"):
+                        continue
 
-                        filtered_items.append(
-                            {
-                                "link": link,
-                                "title": title,
-                                "snippet": snippet,
-                                "priority": source_priority(link),
-                            }
-                        )
+                    if link in seen_links:
+                        continue
+                    seen_links.add(link)
 
-                    # Prefer BBC/Guardian links while preserving stability for equal scores.
-                    ranked_items = sorted(
-                        enumerate(filtered_items),
-                        key=lambda pair: (-int(pair[1]["priority"]), pair[0]),
+                    filtered_items.append(
+                        {
+                            "link": link,
+                            "title": title,
+                            "snippet": snippet,
+                            "priority": source_priority(link),
+                        }
                     )
 
-                    # Build deterministic JSON output for tool-call consumption.
-                    results = []
-                    max_results = 6
-                    for idx, (_, item) in enumerate(ranked_items[:max_results], start=1):
-                        link_value = str(item["link"])
-                        title_value = str(item["title"])
-                        snippet_value = str(item["snippet"])
-
-                        hostname = urlparse(link_value).netloc.lower()
-                        if "bbc." in hostname:
-                            source = "BBC"
-                        elif (
-                            "theguardian.com" in hostname
-                            or "guardian.co.uk" in hostname
-                        ):
-                            source = "Guardian"
-                        else:
-                            source = hostname or "Unknown"
-
-                        results.append(
-                            {
-                                "rank": idx,
-                                "source": source,
-                                "title": title_value or "No title",
-                                "link": link_value,
-                                "snippet": snippet_value or "No snippet",
-                                "is_preferred_source": source in {"BBC", "Guardian"},
-                            }
-                        )
+                # Prefer BBC/Guardian links while preserving stability for equal scores.
+                ranked_items = sorted(
+                    enumerate(filtered_items),
+                    key=lambda pair: (-int(pair[1]["priority"]), pair[0]),
+                )
 
-                    content = json.dumps(
-                        {
-                            "ok": True,
-                            "query": clean_query,
-                            "result_count": len(results),
-                            "results": results,
-                            "guidance": (
-                                "Prefer rank 1 unless another result is clearly more relevant. "
-                                "Use get_link with the chosen result link for full page content."
-                            )
-                        },
-                        ensure_ascii=True,
-                    )
+                # Build deterministic JSON output for tool-call consumption.
+                results = []
+                max_results = 6
+                for idx, (_, item) in enumerate(ranked_items[:max_results], start=1):
+                    link_value = str(item["link"])
+                    title_value = str(item["title"])
+                    snippet_value = str(item["snippet"])
+
+                    hostname = urlparse(link_value).netloc.lower()
+                    if "bbc." in hostname:
+                        source = "BBC"
+                    elif (
+                        "theguardian.com" in hostname
+                        or "guardian.co.uk" in hostname
+                    ):
+                        source = "Guardian"
+                    else:
+                        source = hostname or "Unknown"
 
-                    # Print success
-                    pretty_log_json(content, "Got search results")
-                else:
-                    error_message = f"HTTP {response.status}"
-                    try:
-                        error_payload = await response.json(content_type=None)
-                        if isinstance(error_payload, dict):
-                            api_message = str(error_payload.get("error", "")).strip()
-                            if api_message:
-                                error_message = f"HTTP {response.status}: {api_message}"
-                    except (ValueError, json.JSONDecodeError):
-                        raw_error = (await response.text()).strip()
-                        if raw_error:
-                            error_message = f"HTTP {response.status}: {raw_error[:400]}"
-
-                    # Return an error
-                    content = json.dumps(
+                    results.append(
                         {
-                            "ok": False,
-                            "query": clean_query,
-                            "error": error_message,
-                            "results": [],
-                        },
-                        ensure_ascii=True,
+                            "rank": idx,
+                            "source": source,
+                            "title": title_value or "No title",
+                            "link": link_value,
+                            "snippet": snippet_value or "No snippet",
+                            "is_preferred_source": source in {"BBC", "Guardian"},
+                        }
                     )
 
-                    pretty_log_json(content, "Search API returned an error")
+                content = json.dumps(
+                    {
+                        "ok": True,
+                        "query": clean_query,
+                        "result_count": len(results),
+                        "results": results,
+                        "guidance": (
+                            "Prefer rank 1 unless another result is clearly more relevant. "
+                            "Use get_link with the chosen result link for full page content, "
+                            "or get_links to read several results at once."
+                        )
+                    },
+                    ensure_ascii=True,
+                )
+
+                # Print success
+                pretty_log_json(content, "Got search results")
+
+                # Keep the results for repeat searches, saving them off the event loop
+                search_cache.Put(cache_key, content)
+                await asyncio.to_thread(search_cache.Save)
+            else:
+                error_message = f"HTTP {response.status}"
+                try:
+                    error_payload = await response.json(content_type=None)
+                    if isinstance(error_payload, dict):
+                        api_message = str(error_payload.get("error", "")).strip()
+                        if api_message:
+                            error_message = f"HTTP {response.status}: {api_message}"
+                except (ValueError, json.JSONDecodeError):
+                    raw_error = (await response.text()).strip()
+                    if raw_error:
+                        error_message = f"HTTP {response.status}: {raw_error[:400]}"
+
+                # Return an error
+                content = json.dumps(
+                    {
+                        "ok": False,
+                        "query": clean_query,
+                        "error": error_message,
+                        "results": [],
+                    },
+                    ensure_ascii=True,
+                )
+
+                pretty_log_json(content, "Search API returned an error")
     except aiohttp.ClientError as exc:
         content = json.dumps(
             {
@@ -784,16 +951,11 @@ async def search(query: str) -> str:
     return content
 
 
-async def get_link(link: str) -> str:
-    """Gets the body of a web page from the link returned by the search"""
-    print(f"Getting link {link}...")
-
-    def normalise_whitespace(value: str) -> str:
-        return re.sub(r"\s+", " ", value).strip()
-
-    def is_boilerplate(text: str) -> bool:
-        lowered = text.lower()
-        blocked_phrases = [
+# Phrases which mark a line of a page as boilerplate rather than content, matched in one pass
+BOILERPLATE_REGEX = re.compile(
+    "|".join(
+        re.escape(phrase)
+        for phrase in [
             "skip to content",
             "cookie",
             "privacy policy",
@@ -805,108 +967,274 @@ async def get_link(link: str) -> str:
             "all rights reserved",
             "share this",
         ]
-        return any(phrase in lowered for phrase in blocked_phrases)
+    ),
+    re.IGNORECASE,
+)
 
-    def extract_text_from_container(container) -> list[str]:
-        lines: list[str] = []
-        for node in container.select("h1, h2, h3, p, li, blockquote"):
-            text = normalise_whitespace(node.get_text(" ", strip=True))
-            if not text or is_boilerplate(text):
-                continue
-            lines.append(text)
-        return lines
+WHITESPACE_REGEX = re.compile(r"\s+")
 
-    def parse_page_content(html: str, page_url: str) -> str:
-        bs = BeautifulSoup(html, "html.parser")
 
-        # Remove common non-content sections before extraction.
-        for removable in bs.select(
-            "script, style, noscript, svg, nav, footer, header, aside, form, button"
-        ):
-            removable.decompose()
+def normalise_whitespace(value: str) -> str:
+    return WHITESPACE_REGEX.sub(" ", value).strip()
 
-        hostname = urlparse(page_url).netloc.lower()
-        selectors: list[str]
 
-        if "bbc." in hostname:
-            selectors = [
-                "main#main-content article",
-                "main[role='main'] article",
-                "article",
-                "main#main-content",
-            ]
-        elif "theguardian.com" in hostname or "guardian.co.uk" in hostname:
-            selectors = [
-                "div[data-gu-name='body']",
-                ".article-body-commercial-selector",
-                "main article",
-                "article",
-            ]
-        else:
-            selectors = ["article", "main", "[role='main']"]
+def extract_text_from_container(container) -> list[str]:
+    lines: list[str] = []
+    for node in container.select("h1, h2, h3, p, li, blockquote"):
+        text = normalise_whitespace(node.get_text(" ", strip=True))
+        if not text or BOILERPLATE_REGEX.search(text):
+            continue
+        lines.append(text)
+    return lines
 
-        extracted_lines: list[str] = []
 
-        for selector in selectors:
-            container = bs.select_one(selector)
-            if container is None:
-                continue
-            extracted_lines = extract_text_from_container(container)
-            if len(extracted_lines) >= 5:
-                break
+def parse_page_content(html: str | bytes, page_url: str, encoding: str | None = None) -> str:
+    # Raw bytes are decoded by BeautifulSoup, using the encoding from the headers or the page itself
+    bs = BeautifulSoup(html, "html.parser", from_encoding=encoding if isinstance(html, bytes) else None)
 
-        if not extracted_lines:
-            # Final fallback if we can't find a useful article/main container.
-            extracted_lines = extract_text_from_container(bs)
+    # Remove common non-content sections before extraction.
+    for removable in bs.select(
+        "script, style, noscript, svg, nav, footer, header, aside, form, button"
+    ):
+        removable.decompose()
 
-        # De-duplicate while preserving order.
-        deduped_lines: list[str] = []
-        seen: set[str] = set()
-        for line in extracted_lines:
-            if line in seen:
-                continue
-            seen.add(line)
-            deduped_lines.append(line)
+    hostname = urlparse(page_url).netloc.lower()
+    selectors: list[str]
 
-        return "\n".join(deduped_lines)
+    if "bbc." in hostname:
+        selectors = [
+            "main#main-content article",
+            "main[role='main'] article",
+            "article",
+            "main#main-content",
+        ]
+    elif "theguardian.com" in hostname or "guardian.co.uk" in hostname:
+        selectors = [
+            "div[data-gu-name='body']",
+            ".article-body-commercial-selector",
+            "main article",
+            "article",
+        ]
+    else:
+        selectors = ["article", "main", "[role='main']"]
 
-    # Set the headers
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/133.0.0.0 Safari/537.36"
-        ),
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "en-GB,en;q=0.9",
-    }
+    extracted_lines: list[str] = []
 
-    # Open a session
-    async with aiohttp.ClientSession(headers=headers) as session:
-        # Send the request
-        async with session.get(link) as response:
-            # Check the status code
-            if response.status == 200:
-                # Get the response content
-                response_text = await response.text()
+    for selector in selectors:
+        container = bs.select_one(selector)
+        if container is None:
+            continue
+        extracted_lines = extract_text_from_container(container)
+        if len(extracted_lines) >= 5:
+            break
 
-                # Parse and clean the article text.
-                content = parse_page_content(response_text, link)
+    if not extracted_lines:
+        # Final fallback if we can't find a useful article/main container.
+        extracted_lines = extract_text_from_container(bs)
 
-                # Print success
-                print(f"Got Content\n{content}\n\n")
+    # De-duplicate while preserving order.
+    return "\n".join(dict.fromkeys(extracted_lines))
 
-            else:
+
+async def fetch_page_content(link: str) -> str:
+    # Ask for the page only if it has changed since the cached copy, reusing the extracted text if not
+    cached_page = page_cache.Get(link)
+
+    headers = dict(PAGE_HEADERS)
+
+    if cached_page is not None:
+        if cached_page["etag"]:
+            headers["If-None-Match"] = cached_page["etag"]
+
+        if cached_page["last_modified"]:
+            headers["If-Modified-Since"] = cached_page["last_modified"]
+
+    try:
+        # Send the request on the shared session, which applies the default timeouts
+        async with get_http_session().get(link, headers=headers) as response:
+            if response.status == 304 and cached_page is not None:
+                print("Page not modified, using cached content")
+                page_cache.Put(link, cached_page)
+                return cached_page["content"]
+
+            # Check the status code
+            if response.status != 200:
                 # Log the error
                 print("Error downloading URL")
 
                 # Return the content of the response as the error message
-                content = f"Error: {response.status}"
+                return f"Error: {response.status}"
+
+            # Read the page in chunks, stopping at the byte limit so a huge page cannot use up memory
+            body = bytearray()
+
+            async for chunk in response.content.iter_chunked(PAGE_CHUNK_BYTES):
+                body.extend(chunk[: PAGE_MAX_BYTES - len(body)])
+
+                if len(body) >= PAGE_MAX_BYTES:
+                    print(f"Page truncated at {PAGE_MAX_BYTES} bytes")
+                    break
+
+            encoding = response.charset
+            etag = response.headers.get("ETag", "")
+            last_modified = response.headers.get("Last-Modified", "")
+    except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+        # Log the error and return it as the content
+        print(f"Error downloading URL: {exc!r}")
+        return f"Error: {exc!r}"
+
+    # The page may be unchanged even without validators, in which case the extracted text is reused
+    digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+
+    if cached_page is not None and cached_page["digest"] == digest:
+        content = cached_page["content"]
+    else:
+        # Parse and clean the article text on a worker thread so the event loop is not held up
+        content = await asyncio.to_thread(parse_page_content, bytes(body), link, encoding)
+
+    page_cache.Put(
+        link,
+        {
+            "etag": etag,
+            "last_modified": last_modified,
+            "digest": digest,
+            "content": content,
+        },
+    )
+
+    return content
+
+
+async def get_link(link: str) -> str:
+    """Gets the body of a web page from the link returned by the search"""
+    print(f"Getting link {link}...")
+
+    content = await fetch_page_content(link)
+
+    # Print the content
+    print(f"Got Content\n{content}\n\n")
 
     # Return the content
     return content
 
 
+def json_size(content: str) -> int:
+    # The number of bytes the text takes up as a JSON string, with its escapes but without the quotes
+    return len(json.dumps(content, ensure_ascii=False).encode("utf-8")) - 2
+
+
+def trim_to_bytes(content: str, max_bytes: int) -> str:
+    # Cut the text so it fits the byte limit once written as JSON, at the last line break if there is one so lines are kept whole
+    if json_size(content) <= max_bytes:
+        return content
+
+    # Find the longest start of the text that fits, every character takes at least a byte so no more than the limit can
+    shortest, longest = 0, min(len(content), max_bytes)
+
+    while shortest < longest:
+        length = (shortest + longest + 1) // 2
+
+        if json_size(content[:length]) <= max_bytes:
+            shortest = length
+        else:
+            longest = length - 1
+
+    trimmed = content[:shortest]
+    line_end = trimmed.rfind("\n")
+
+    return trimmed[:line_end] if line_end > 0 else trimmed
+
+
+async def get_links(links: list[str]) -> str:
+    """Gets the bodies of several web pages at once, sharing a size budget between them"""
+    # Drop repeated links while keeping the order, and limit how many are fetched
+    links = list(dict.fromkeys(link.strip() for link in links if link.strip()))[:GET_LINKS_MAX_LINKS]
+    print(f"Getting links {links}...")
+
+    # Limit how many pages are fetched from each host at once so no site is hammered
+    host_limits: dict[str, asyncio.Semaphore] = {}
+
+    async def fetch_limited(link: str) -> str:
+        host_limit = host_limits.setdefault(
+            urlparse(link).netloc.lower(), asyncio.Semaphore(GET_LINKS_PER_HOST)
+        )
+
+        async with host_limit:
+            return await fetch_page_content(link)
+
+    # Fetch the pages concurrently, each is parsed on a worker thread
+    fetched = await asyncio.gather(
+        *(fetch_limited(link) for link in links), return_exceptions=True
+    )
+    contents = [
+        content if isinstance(content, str) else f"Error: {content!r}"
+        for content in fetched
+    ]
+
+    # Share the budget between the pages, the shortest first so any they do not use goes to the longer ones
+    budgets = [0] * len(contents)
+    remaining_bytes = GET_LINKS_MAX_BYTES
+
+    for count, index in enumerate(
+        sorted(range(len(contents)), key=lambda index: json_size(contents[index]))
+    ):
+        share = remaining_bytes // (len(contents) - count)
+        budgets[index] = min(json_size(contents[index]), share)
+        remaining_bytes -= budgets[index]
+
+    results = []
+
+    for link, content, budget in zip(links, contents, budgets):
+        trimmed = trim_to_bytes(content, budget)
+        results.append(
+            {
+                "link": link,
+                "ok": not content.startswith("Error:"),
+                "truncated": trimmed != content,
+                "content": trimmed,
+            }
+        )
+
+    # Write the text as it is rather than escaped, so the budget above matches the size of the content sent back
+    content = json.dumps({"results": results}, ensure_ascii=False)
+
+    # Print the sizes of the content returned
+    print(f"Got content for {len(results)} links, {len(content)} characters")
+
+    return content
+
+
+async def refresh_words(context: CallbackContext) -> None:
+    # Check for new word lists, swapping them into the solver when they change
+    try:
+        await solver_service.RefreshAsync(get_http_session())
+    except Exception as exc:
+        logger.warning('Word refresh failed "%s"', exc)
+
+
+async def post_init(application: Application) -> None:
+    # Open the shared HTTP session now the event loop is running
+    get_http_session()
+
+    if application.job_queue is not None:
+        # Refresh the word lists once the bot is running and then once per download cache lifetime
+        application.job_queue.run_repeating(refresh_words, interval=Constants.DOWNLOAD_CACHE_TTL, first=WORD_REFRESH_FIRST_DELAY, name="refresh_words")
+
+        # Update the stats, solve the words and render the distribution image once a day
+        application.job_queue.run_daily(RunGameHandler, DAILY_PRECOMPUTE_TIME, name="daily_precompute")
+    else:
+        print("No job queue available, the word refresh and daily precompute will not run")
+
+
+async def post_shutdown(application: Application) -> None:
+    # Save any search results not yet saved
+    search_cache.Save()
+
+    # Close the shared HTTP session and its pooled connections
+    if http_session is not None and not http_session.closed:
+        await http_session.close()
+
+
 # Log errors
 async def error(update, context):
     logger.warning('Update "%s" caused error "%s"', update, context.error)
@@ -929,7 +1257,13 @@ def main():
         sys.exit()
 
     # Create the application
-    application = ApplicationBuilder().token(token).build()
+    application = (
+        ApplicationBuilder()
+        .token(token)
+        .post_init(post_init)
+        .post_shutdown(post_shutdown)
+        .build()
+    )
 
     # On receipt of a /guess command call the guess() function
     application.add_handler(CommandHandler("guess", guess))
@@ -1038,6 +1372,7 @@ if __name__ == "__main__":
     For football-related data questions, you call the query_football tool first and use its result as the primary source of truth.
     You are able to search the internet for information to answer questions using the internet_search tool.
     You can then download the body of a web page from a link to provide more information to search queries using the get_link tool.
+    When several search results are useful you download them together with the get_links tool.
     You favour downloading BBC or Guardian web pages where possible.
     You are factual without being overly verbose.
     You don't ask any questions at the end of your responses.
@@ -1245,5 +1580,31 @@ if __name__ == "__main__":
     # Add the function to the client
     simple_openai_client.add_tool(tool, get_link)
 
+    # Create the Open AI function to get several web pages at once
+    func = open_ai_models.OpenAIFunction(
+        name="get_links",
+        description=(
+            "Gets the bodies of several web pages returned by the search at once, "
+            "use this instead of repeated get_link calls when more than one result is useful"
+        ),
+        parameters=open_ai_models.OpenAIParameters(
+            properties={
+                "links": open_ai_models.OpenAIParameter(
+                    type="array",
+                    items=open_ai_models.OpenAIParameter(type="string"),
+                    description=f"The links to the pages to download, at most {GET_LINKS_MAX_LINKS}",
+                ),
+            },
+            required=["links"],
+        ),
+    )
+
+    tool = open_ai_models.OpenAITool(
+        function=func,
+    )
+
+    # Add the function to the client
+    simple_openai_client.add_tool(tool, get_links)
+
     # Call the main function
     main()